@@ -1,21 +1,15 @@
-from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends
-from datetime import datetime, timezone
-from app.db.crud import cleanup_old_data
-from app.db.database import SessionLocal
+from fastapi import APIRouter
+from app.utils.cleanup_scheduler import run_cleanup, get_cleanup_stats
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/cleanup/")
-async def cleanup_expired_entries(db: Session = Depends(get_db)):
-    current_time = datetime.now(timezone.utc)
-    result = cleanup_old_data(db, current_time)
+async def cleanup_expired_entries():
+    # Runs the same batched pass as the background scheduler, so its metrics cover manual runs too.
+    result = await run_cleanup()
+
+    return {"status": "cleanup complete", **result}
 
-    return {"status": "cleanup complete", **result}
\ No newline at end of file
+@router.get("/stats/")
+async def cleanup_stats():
+    return get_cleanup_stats()
@@ -1,44 +1,130 @@
 import io
+import config
 from app.db import crud
-from sqlalchemy.orm import Session
-from typing import Optional, List, Dict
-from app.db.database import SessionLocal
+from app.db.database import SessionLocal, get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Optional, List, Dict, Tuple
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from app.utils.similarity import SimilarityScorer
+from app.utils.nlp_registry import get_scorer
+from app.utils.uploads import read_upload
 from app.utils.job_description_parser import extract_text_job_file
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
-from app.utils.exports import generate_csv_ranked_resumes, generate_excel_from_ranked_data
+from app.utils.exports import iter_csv_ranked_resumes, generate_excel_from_ranked_data
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async def score_pool(job: Dict, batches: AsyncIterator[List[Dict]], scorer: SimilarityScorer) -> List[Dict]:
+    results = []
+    async for batch in batches:
+        # Scores each streamed batch in a worker thread, so the event loop keeps serving other requests meanwhile.
+        results.extend(await run_in_threadpool(scorer.score_resumes, job, batch))
 
-def get_ranked_data(job_id: str, db: Session) -> List[Dict]:
-    job_text, resumes = crud.get_job_and_resumes(db, job_id)
+    return scorer.select_top(results)
 
-    if not job_text:
+async def refresh_job_skills(db: AsyncSession, scorer: SimilarityScorer, job: Dict) -> str:
+    # Re-extracts the job's skills when they were extracted with another taxonomy version (or never stored), and
+    # returns the current version.
+    taxonomy_version = scorer.taxonomy.version
+    if job["skills"] is None or job["skills_taxonomy_version"] != taxonomy_version:
+        job["skills"] = await run_in_threadpool(scorer.extract_skills_from_job_description, job["text"])
+        job["skills_taxonomy_version"] = taxonomy_version
+        await crud.update_job_skills(db, job["id"], job["skills"], taxonomy_version)
+
+    return taxonomy_version
+
+async def rank_job(job_id: str, db: AsyncSession, scorer: SimilarityScorer) -> Tuple[int, str, Optional[List[Dict]]]:
+    # Brings the job's stored ranking up to date; also returns the fully sorted pool when it had to be scored from scratch.
+    job = await crud.get_job(db, job_id)
+
+    if not job:
         raise HTTPException(status_code=404, detail=f"Job Description with ID '{job_id}' not found.")
-    if not resumes:
+
+    taxonomy_version = await refresh_job_skills(db, scorer, job)
+    version = (job["resume_set_version"], taxonomy_version)
+    previous_version = (job["ranked_version"], job["ranked_taxonomy_version"])
+
+    # Reuses the stored ranking while no resumes have been added since it was computed. A ranking scored with
+    # another taxonomy version is never reused or extended, since its scores would mix with the new ones.
+    current_taxonomy = job["ranked_taxonomy_version"] == taxonomy_version
+    cache_status = "hit" if current_taxonomy and job["ranked_version"] == job["resume_set_version"] else "miss"
+    total = await crud.count_ranked_results(db, job_id) if current_taxonomy and job["ranked_version"] is not None else 0
+
+    if total and cache_status == "miss":
+        # Scores only the resumes added since the stored ranking; the (combined_score, seq) order merges them in.
+        new_ranked = await score_pool(job, crud.iter_resume_batches(db, job_id, unranked_only=True), scorer)
+        stored = await crud.store_ranked_results(db, job_id, new_ranked, version, previous_version, replace=False)
+
+        # A concurrent rank stored its update first, so the stored ranking is counted again instead.
+        total = total + len(new_ranked) if stored else await crud.count_ranked_results(db, job_id)
+        cache_status = "incremental"
+
+    if total:
+        return total, cache_status, None
+
+    # Streams the pool through the scorer, then fully sorts it once and stores it so later ranks and exports just read it back.
+    ranked = await score_pool(job, crud.iter_resume_batches(db, job_id), scorer)
+    if not ranked:
         raise HTTPException(status_code=404, detail="No resumes found for this job.")
 
-    scorer = SimilarityScorer()
-    job_dict = {'text': job_text}
-    ranked = scorer.rank_resumes_enhanced(job_dict, resumes)
+    if not await crud.store_ranked_results(db, job_id, ranked, version, previous_version):
+        # A concurrent rank stored its ranking first; reads go to that one so every page comes from the same ranking.
+        return await crud.count_ranked_results(db, job_id), "miss", None
+
+    return len(ranked), "miss", ranked
+
+async def decorate_page(db: AsyncSession, scorer: SimilarityScorer, ranked: List[Dict]) -> List[Dict]:
+    # Adds the skills summary and contact details only for the rows being returned, DB_STREAM_BATCH rows per query,
+    # so an unpaged rank or Excel export of a large pool never sends one huge IN list.
+    page_size = max(1, config.DB_STREAM_BATCH)
+    decorated = []
+    for start in range(0, len(ranked), page_size):
+        page = ranked[start:start + page_size]
+        resumes = await crud.get_resumes_by_uuid(db, [row["uuid"] for row in page])
+        decorated.extend(await run_in_threadpool(scorer.decorate_results, page, resumes))
+    return decorated
+
+async def get_ranked_data(job_id: str, db: AsyncSession, scorer: SimilarityScorer, limit: Optional[int] = None, offset: int = 0) -> Tuple[List[Dict], int, str]:
+    total, cache_status, scored = await rank_job(job_id, db, scorer)
 
-    return ranked
+    if scored is None:
+        ranked = await crud.get_ranked_results(db, job_id, limit, offset)
+    else:
+        ranked = scored[offset:] if limit is None else scored[offset:offset + limit]
+
+    return await decorate_page(db, scorer, ranked), total, cache_status
+
+async def stream_ranked_csv(job_id: str, total: int, scorer: SimilarityScorer) -> AsyncIterator[bytes]:
+    # Uses its own session: the request's one is closed before a streamed body is sent.
+    page_size = max(1, config.DB_STREAM_BATCH)
+    # Sends the header row straight away.
+    yield b"".join(iter_csv_ranked_resumes([]))
+
+    async with SessionLocal() as db:
+        # Reads the stored ranking a page at a time and sends each page as soon as it is encoded.
+        async for page in crud.iter_ranked_results(db, job_id, page_size, total):
+            yield b"".join(iter_csv_ranked_resumes(await decorate_page(db, scorer, page), header=False))
 
 @router.post("/upload-job-description/")
-async def upload_job_description(job_text: Optional[str] = Form(None), job_file: Optional[UploadFile] = File(None), db: Session = Depends(get_db)):
+async def upload_job_description(job_text: Optional[str] = Form(None), job_file: Optional[UploadFile] = File(None), db: AsyncSession = Depends(get_db), scorer: SimilarityScorer = Depends(get_scorer)):
     if not job_text and not job_file:
         raise HTTPException(status_code=400, detail="Provide job_text or job_file.")
 
-    job_content = job_text or extract_text_job_file(job_file)
-    job_response = crud.insert_job_description(db, job_content.strip())
+    if job_text:
+        job_content = job_text.strip()
+    else:
+        data, mime = await read_upload(job_file, config.MAX_JOB_DESCRIPTION_MB, config.ALLOWED_JOB_DESCRIPTION_MIME)
+        try:
+            job_content = extract_text_job_file(data, mime).strip()
+        except Exception as e:
+            # Sniffing only checks the leading bytes, e.g. any ZIP passes as a .docx until python-docx opens it.
+            print(f"Error reading job description file {job_file.filename}: {e}")
+            raise HTTPException(status_code=415, detail=f"'{job_file.filename}' is not a readable .pdf, .docx or .txt file.")
+
+    # Extracts the job's skills, noun phrases and required years once, so ranking only reads them back.
+    job_features = await run_in_threadpool(scorer.build_job_features, job_content)
+    job_response = await crud.insert_job_description(db, job_content, job_features)
 
     return {
         "message": "Job Description uploaded and stored.",
@@ -47,47 +133,67 @@ async def upload_job_description(job_text: Optional[str] = Form(None), job_file:
     }
 
 @router.post("/rank-resumes/")
-async def rank_resumes_endpoint(job_id: str = Form(...), db: Session = Depends(get_db)):
-    results = get_ranked_data(job_id, db)
+async def rank_resumes_endpoint(job_id: str = Form(...), limit: Optional[int] = Form(None), offset: int = Form(0), db: AsyncSession = Depends(get_db), scorer: SimilarityScorer = Depends(get_scorer)):
+    if (limit is not None and limit < 1) or offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be positive and offset must not be negative.")
+
+    results, total, cache_status = await get_ranked_data(job_id, db, scorer, limit, offset)
     return {
         "job_description_id": job_id,
-        "total_resumes": len(results),
+        "cache_hit": cache_status == "hit",
+        "cache_status": cache_status,
+        "total_resumes": total,
+        "offset": offset,
+        "limit": limit,
         "ranked_resumes": results
     }
 
 @router.post("/download-ranked-resumes-csv/")
-async def download_ranked_csv(job_id: str = Form(...), db: Session = Depends(get_db)):
-    ranked = get_ranked_data(job_id, db)
-    csv_bytes = generate_csv_ranked_resumes(ranked)
+async def download_ranked_csv(job_id: str = Form(...), db: AsyncSession = Depends(get_db), scorer: SimilarityScorer = Depends(get_scorer)):
+    # Ranks (or reuses the stored ranking) before streaming, so errors still come back as a status code.
+    total, cache_status, _ = await rank_job(job_id, db, scorer)
 
     return StreamingResponse(
-        io.BytesIO(csv_bytes),
+        stream_ranked_csv(job_id, total, scorer),
         media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename=ranked_resumes_{job_id}.csv"}
+        headers={
+            "Content-Disposition": f"attachment; filename=ranked_resumes_{job_id}.csv",
+            "X-Ranking-Cache": cache_status
+        }
     )
 
 @router.post("/download-ranked-resumes-excel/")
-async def download_ranked_excel(job_id: str = Form(...), db: Session = Depends(get_db)):
-    ranked = get_ranked_data(job_id, db)
+async def download_ranked_excel(job_id: str = Form(...), db: AsyncSession = Depends(get_db), scorer: SimilarityScorer = Depends(get_scorer)):
+    ranked, _, cache_status = await get_ranked_data(job_id, db, scorer)
     excel_bytes = generate_excel_from_ranked_data(ranked)
 
     return StreamingResponse(
         io.BytesIO(excel_bytes),
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename=ranked_resumes_{job_id}.xlsx"}
+        headers={
+            "Content-Disposition": f"attachment; filename=ranked_resumes_{job_id}.xlsx",
+            "X-Ranking-Cache": cache_status
+        }
     )
 
 
 @router.get("/resume-analysis/{job_id}/{resume_uuid}")
-async def resume_analysis_endpoint(job_id: str, resume_uuid: str, db: Session = Depends(get_db)):
-    ranked_resumes = get_ranked_data(job_id, db)
-
-    for resume in ranked_resumes:
-        if str(resume.get("uuid")) == resume_uuid:
-            return {
-                "job_description_id": job_id,
-                "resume_uuid": resume_uuid,
-                "analysis": resume
-            }
-
-    raise HTTPException(status_code=404, detail=f"Resume with UUID '{resume_uuid}' not found for job ID '{job_id}'.")
+async def resume_analysis_endpoint(job_id: str, resume_uuid: str, db: AsyncSession = Depends(get_db), scorer: SimilarityScorer = Depends(get_scorer)):
+    # Loads only the job's stored features and the one resume, so the cost doesn't grow with the pool.
+    job = await crud.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job Description with ID '{job_id}' not found.")
+
+    resume = await crud.get_resume(db, job_id, resume_uuid)
+    if not resume:
+        raise HTTPException(status_code=404, detail=f"Resume with UUID '{resume_uuid}' not found for job ID '{job_id}'.")
+
+    await refresh_job_skills(db, scorer, job)
+
+    analysis = await run_in_threadpool(scorer.get_detailed_analysis, job, resume)
+
+    return {
+        "job_description_id": job_id,
+        "resume_uuid": resume_uuid,
+        "analysis": {"uuid": resume["uuid"], "filename": resume["filename"], **analysis}
+    }
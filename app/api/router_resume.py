@@ -1,68 +1,192 @@
 import os
 import uuid
-from typing import List
+import config
+import asyncio
+import hashlib
+import time
 from app.db import crud
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
-from app.utils.resume_parser import ResumeParser
+from itertools import islice
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from app.utils import parse_pool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import SessionLocal, get_db
+from app.utils.similarity import SimilarityScorer
+from fastapi.concurrency import run_in_threadpool
+from app.utils.nlp_registry import get_scorer
+from app.utils.skill_taxonomy import get_taxonomy
+from app.utils.skill_matcher import get_skill_matcher
+from app.utils.uploads import read_upload, is_allowed_resume
+from app.utils.archive import detect_archive_format, iter_archive_members
 from fastapi import APIRouter, UploadFile, Form, Depends, HTTPException
 
 router = APIRouter()
 
-UPLOAD_FOLDER = 'app/static/uploads_resumes'
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# Caps how many failed filenames a task reports, so its status stays small however large the archive is.
+ARCHIVE_TASK_LIST_LIMIT = 100
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Progress of archive uploads by task id; kept in memory, so it is per process and lost on restart. Finished
+# tasks are evicted after ARCHIVE_TASK_TTL_SECONDS.
+archive_tasks: Dict[str, Dict] = {}
+# Monotonic finish time of each finished task, oldest first, so finished tasks can be evicted.
+_finished_tasks: Dict[str, float] = {}
+_running_ingestions = set()
 
-@router.post('/upload-resume/')
-async def upload_resume(job_id: str = Form(...), resumes: List[UploadFile] = Form(...), db: Session = Depends(get_db)):
+def _prune_archive_tasks() -> None:
+    # Evicts finished tasks once their status has been kept for ARCHIVE_TASK_TTL_SECONDS, and the oldest finished
+    # ones beyond MAX_ARCHIVE_TASKS; running tasks are always kept.
+    cutoff = time.monotonic() - config.ARCHIVE_TASK_TTL_SECONDS
+    for task_id, finished in list(_finished_tasks.items()):
+        if finished > cutoff and len(archive_tasks) <= config.MAX_ARCHIVE_TASKS:
+            break
+        del _finished_tasks[task_id]
+        archive_tasks.pop(task_id, None)
+
+async def cancel_archive_ingestions() -> None:
+    # Stops running archive ingestions at shutdown, before the parse pool and engine they use go away.
+    for ingestion in list(_running_ingestions):
+        ingestion.cancel()
+    await asyncio.gather(*_running_ingestions, return_exceptions=True)
+
+def _record_failed(task: Dict, names: List[str]) -> None:
+    task["failed"] += len(names)
+    task["failed_resumes"].extend(names[:ARCHIVE_TASK_LIST_LIMIT - len(task["failed_resumes"])])
+
+async def parse_upload(data: bytes) -> Dict:
+    # Hands the PDF bytes straight to a parser worker; nothing is written to disk.
+    enhanced_data = await parse_pool.parse_resume(data)
+    return {
+        "text": enhanced_data.get('raw_text', '').strip(),
+        "skills": enhanced_data.get('skills', []),
+        "experience": enhanced_data.get('experience', []),
+        "education": enhanced_data.get('education', []),
+        "contact": enhanced_data.get('contact', {}),
+        "timings": enhanced_data.get('timings', {})
+    }
+
+def _extract_skills(texts: List[str]) -> List[Dict[str, List[str]]]:
+    # Blocking: may reload the taxonomy and rebuild the matcher, then scans every text, so it runs in a thread.
+    matcher = get_skill_matcher(get_taxonomy())
+    return [matcher.extract(text) for text in texts]
+
+async def ingest_resumes(db: AsyncSession, scorer: SimilarityScorer, job_id: str, files: List[Tuple[str, bytes]]) -> Dict:
+    # Parses, featurizes and stores one batch of (filename, bytes) pairs; shared by the form and archive uploads.
     parsed_resumes = []
     failed_uploads = []
-    resume_filenames = []
+    parse_timings = {}
+
+    hashes = [hashlib.sha256(data).hexdigest() for _, data in files]
+
+    # Skips parsing entirely for files whose bytes were already parsed, e.g. the same PDF uploaded for another job.
+    cached = await crud.get_parsed_documents(db, list(set(hashes)))
+    if cached:
+        # Re-derives cached skills with the current taxonomy, which may have been reloaded since the entry was stored.
+        documents = list(cached.values())
+        skills = await run_in_threadpool(_extract_skills, [document["text"] for document in documents])
+        for document, document_skills in zip(documents, skills):
+            document["skills"] = document_skills
+
+    to_parse = {sha256: data for sha256, (_, data) in zip(hashes, files) if sha256 not in cached}
+
+    # Parses every remaining distinct file of the batch concurrently in the process pool.
+    results = await asyncio.gather(*(parse_upload(data) for data in to_parse.values()), return_exceptions=True)
 
-    parser = ResumeParser()
+    parsed_documents = {}
+    for sha256, result in zip(to_parse, results):
+        if isinstance(result, Exception):
+            print(f"Error processing resume {sha256}: {result}")
+            continue
 
-    for file in resumes:
-        resume_id = str(uuid.uuid4())
-        file_name = f"{resume_id}_{file.filename}"
-        file_path = os.path.join(UPLOAD_FOLDER, file_name)
+        # Totals each extractor's time across the batch, so the slowest one stands out.
+        for extractor, elapsed_ms in result.pop("timings").items():
+            parse_timings[extractor] = round(parse_timings.get(extractor, 0) + elapsed_ms, 3)
+        parsed_documents[sha256] = result
+
+    if parsed_documents:
+        # Computes the noun phrases and NER contact fields now, so ranking never has to run spaCy on the resumes.
+        nlp_features = await run_in_threadpool(scorer.build_resume_features_batch, [d["text"] for d in parsed_documents.values()])
+        for document, features in zip(parsed_documents.values(), nlp_features):
+            document.update(features)
 
         try:
-            with open(file_path, "wb") as buffer:
-                buffer.write(await file.read())
-
-            enhanced_data = parser.parse_resume(file_path)
-            parsed_resumes.append({
-                "uuid": resume_id,
-                "filename": file.filename,
-                "text": enhanced_data.get('raw_text', '').strip(),
-                "skills": enhanced_data.get('skills', []),
-                "experience": enhanced_data.get('experience', []),
-                "education": enhanced_data.get('education', []),
-                "contact": enhanced_data.get('contact', {})
-            })
+            await crud.insert_parsed_documents(db, parsed_documents)
         except Exception as e:
-            print(f"Error processing resume {file.filename}: {e}")
-            failed_uploads.append(file.filename)
-        finally:
-            try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-            except Exception as e:
-                print(f"Warning: failed to delete temporary file {file_path} — {e}")
+            # The cache is only an optimization; the upload itself can still succeed.
+            print(f"Warning: failed to cache parsed resumes — {e}")
+
+    cache_hits = 0
+    for (filename, _), sha256 in zip(files, hashes):
+        document = cached.get(sha256) or parsed_documents.get(sha256)
+        if document is None:
+            failed_uploads.append(filename)
+            continue
+
+        cache_hits += sha256 in cached
+        parsed_resumes.append({"uuid": str(uuid.uuid4()), "filename": filename, **document})
 
     if parsed_resumes:
+        # Stores the skills as taxonomy bits too, so ranking can skip resolving skill names.
+        taxonomy = get_taxonomy()
+        for resume in parsed_resumes:
+            resume["skill_bits"] = taxonomy.encode(resume["skills"])
+
+        await crud.insert_resumes(db, job_id, parsed_resumes)
+
+    return {
+        "resumes": [r["filename"] for r in parsed_resumes],
+        "resume_uuids": [r["uuid"] for r in parsed_resumes],
+        "failed_resumes": failed_uploads,
+        "parse_timings_ms": parse_timings,
+        "cache_hits": cache_hits,
+        # Distinct files that had to be parsed; rejected files never reach the cache lookup.
+        "cache_misses": len(to_parse)
+    }
+
+async def _read_resume(file: UploadFile) -> Optional[bytes]:
+    try:
+        data, _ = await read_upload(file, config.MAX_RESUME_MB, config.ALLOWED_RESUME_MIME)
+        return data
+    except HTTPException as e:
+        print(f"Rejected resume {file.filename}: {e.detail}")
+        return None
+
+@router.post('/upload-resume/')
+async def upload_resume(job_id: str = Form(...), resumes: List[UploadFile] = Form(...), db: AsyncSession = Depends(get_db), scorer: SimilarityScorer = Depends(get_scorer)):
+    # The request size limit allows this many files, so larger batches have to be split.
+    if len(resumes) > config.MAX_RESUME_FILES:
+        raise HTTPException(status_code=413, detail=f"At most {config.MAX_RESUME_FILES} resumes can be uploaded at once.")
+
+    result = {"resumes": [], "resume_uuids": [], "failed_resumes": [], "parse_timings_ms": {}, "cache_hits": 0, "cache_misses": 0}
+
+    # Reads and ingests UPLOAD_CONCURRENCY files at a time, so only that many are held in memory whatever the upload size.
+    group_size = max(1, config.UPLOAD_CONCURRENCY)
+    for start in range(0, len(resumes), group_size):
+        group = resumes[start:start + group_size]
+        contents = await asyncio.gather(*(_read_resume(file) for file in group))
+
+        result["failed_resumes"].extend(file.filename for file, data in zip(group, contents) if data is None)
+        files = [(file.filename, data) for file, data in zip(group, contents) if data is not None]
+        if not files:
+            continue
+
         try:
-            crud.insert_resumes(db, job_id, parsed_resumes)
+            group_result = await ingest_resumes(db, scorer, job_id, files)
         except Exception as e:
             print(f"Database error while storing resumes: {e}")
             raise HTTPException(status_code=500, detail="An error occurred while storing resumes.")
-    else:
+
+        result["resumes"].extend(group_result["resumes"])
+        result["resume_uuids"].extend(group_result["resume_uuids"])
+        result["failed_resumes"].extend(group_result["failed_resumes"])
+        result["cache_hits"] += group_result["cache_hits"]
+        result["cache_misses"] += group_result["cache_misses"]
+        for extractor, elapsed_ms in group_result["parse_timings_ms"].items():
+            result["parse_timings_ms"][extractor] = round(result["parse_timings_ms"].get(extractor, 0) + elapsed_ms, 3)
+
+    resume_filenames = result["resumes"]
+    failed_uploads = result["failed_resumes"]
+
+    if not resume_filenames:
         if failed_uploads:
             raise HTTPException(status_code=400, detail=f"No resumes could be processed. Failed: {', '.join(failed_uploads)}")
         else:
@@ -72,12 +196,132 @@ async def upload_resume(job_id: str = Form(...), resumes: List[UploadFile] = For
     if failed_uploads:
         response_message += f" However, the following resumes failed to process: {', '.join(failed_uploads)}."
 
-    for r in parsed_resumes:
-        resume_filenames.append(r["filename"])
-
     return {
         "message": response_message,
-        "count": len(parsed_resumes),
+        "count": len(resume_filenames),
         "resumes": resume_filenames,
-        "failed_resumes": failed_uploads
-    }
\ No newline at end of file
+        "resume_uuids": result["resume_uuids"],
+        "failed_resumes": failed_uploads,
+        "parse_timings_ms": result["parse_timings_ms"],
+        "cache": {"hits": result["cache_hits"], "misses": result["cache_misses"]}
+    }
+
+@router.post('/attach-resumes/')
+async def attach_resumes(job_id: str = Form(...), resume_uuids: List[str] = Form(...), db: AsyncSession = Depends(get_db)):
+    # Adds resumes uploaded for other jobs to this job's pool without re-uploading or re-parsing them.
+    try:
+        result = await crud.attach_resumes(db, job_id, resume_uuids)
+    except Exception as e:
+        print(f"Database error while attaching resumes: {e}")
+        raise HTTPException(status_code=500, detail="An error occurred while attaching resumes.")
+
+    if not result:
+        raise HTTPException(status_code=404, detail="Job description not found.")
+    if not result["attached"] and not result["already_attached"]:
+        raise HTTPException(status_code=404, detail=f"No stored resumes found for: {', '.join(result['not_found'])}")
+
+    return {
+        "message": "Resumes attached to the job.",
+        "job_id": job_id,
+        "count": len(result["attached"]),
+        **result
+    }
+
+async def _ingest_archive(task_id: str, job_id: str, archive_file: BinaryIO, scorer: SimilarityScorer) -> None:
+    task = archive_tasks[task_id]
+    db = SessionLocal()
+    members = iter_archive_members(archive_file, config.MAX_RESUME_MB * 1024 * 1024)
+
+    try:
+        task["status"] = "running"
+        while True:
+            # Pulls the next bounded batch off the archive in a thread, since reading members is blocking IO.
+            batch = await run_in_threadpool(lambda: list(islice(members, config.ARCHIVE_BATCH_SIZE)))
+            if not batch:
+                break
+
+            # Oversized members and ones that aren't an allowed type by their magic bytes are never parsed.
+            files = []
+            for name, data in batch:
+                if data is not None and is_allowed_resume(data):
+                    files.append((name, data))
+                else:
+                    _record_failed(task, [name])
+
+            if files:
+                result = await ingest_resumes(db, scorer, job_id, files)
+                task["stored"] += len(result["resumes"])
+                _record_failed(task, result["failed_resumes"])
+                task["cache_hits"] += result["cache_hits"]
+                task["cache_misses"] += result["cache_misses"]
+
+            task["processed"] += len(batch)
+
+        task["status"] = "completed"
+    except asyncio.CancelledError:
+        # Resumes from batches that were already stored stay stored.
+        task["status"] = "cancelled"
+        raise
+    except Exception as e:
+        print(f"Error ingesting archive for job_id {job_id}: {e}")
+        task["status"] = "failed"
+        task["error"] = str(e)
+    finally:
+        task["finished_at"] = datetime.now(timezone.utc).isoformat()
+        _finished_tasks[task_id] = time.monotonic()
+        members.close()
+        await db.close()
+        archive_file.close()
+
+def _keep_spooled_file(upload: UploadFile) -> BinaryIO:
+    # The request closes (and so deletes) its upload files once the response is sent, which is before ingestion ends.
+    # A duplicated descriptor keeps the same file open for the background task. fileno() first moves a small,
+    # still in-memory upload to disk, so every upload ends up as a real file.
+    archive_file = os.fdopen(os.dup(upload.file.fileno()), "rb")
+    archive_file.seek(0)
+    return archive_file
+
+@router.post('/upload-archive/')
+async def upload_archive(job_id: str = Form(...), archive: UploadFile = Form(...), db: AsyncSession = Depends(get_db), scorer: SimilarityScorer = Depends(get_scorer)):
+    if not await crud.get_job(db, job_id):
+        raise HTTPException(status_code=404, detail="Job description not found.")
+
+    # Reads the archive from the file Starlette already spooled it to, instead of copying it to a second one.
+    archive_file = await run_in_threadpool(_keep_spooled_file, archive)
+    if not await run_in_threadpool(detect_archive_format, archive_file):
+        archive_file.close()
+        raise HTTPException(status_code=400, detail="Unsupported archive format; expected a ZIP or tar file.")
+
+    _prune_archive_tasks()
+    task_id = str(uuid.uuid4())
+    archive_tasks[task_id] = {
+        "task_id": task_id,
+        "job_id": job_id,
+        "archive": archive.filename,
+        "status": "queued",
+        "processed": 0,
+        "stored": 0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+        "failed": 0,
+        "failed_resumes": [],
+        "error": None,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "finished_at": None
+    }
+
+    # Keeps a reference to the task so it isn't garbage-collected while it runs.
+    ingestion = asyncio.create_task(_ingest_archive(task_id, job_id, archive_file, scorer))
+    _running_ingestions.add(ingestion)
+    ingestion.add_done_callback(_running_ingestions.discard)
+
+    return {"message": "Archive received; resumes are being processed.", "task_id": task_id}
+
+@router.get('/upload-archive/{task_id}')
+async def get_archive_status(task_id: str):
+    _prune_archive_tasks()
+    task = archive_tasks.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Archive upload task not found.")
+
+    return task
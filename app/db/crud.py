@@ -1,21 +1,99 @@
+import zlib
 import config
+import hashlib
 from uuid import uuid4
-from typing import List
-from sqlalchemy.orm import Session
-from app.db.models import Job_Description, Resume
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import delete, func, insert, or_, select, update
+from app.db.models import Job_Description, Resume, Job_Application, Ranked_Result, Parsed_Document, Text_Blob
 from datetime import datetime, timedelta, timezone
 
 EXPIRY_HOURS = config.DB_EXPIRY_HOURS
+PARSE_CACHE_EXPIRY_HOURS = config.PARSE_CACHE_EXPIRY_HOURS
+INSERT_CHUNK_SIZE = config.DB_INSERT_CHUNK
+CLEANUP_BATCH_SIZE = config.CLEANUP_BATCH_SIZE
+STREAM_BATCH_SIZE = config.DB_STREAM_BATCH
+COMPRESSION_LEVEL = config.TEXT_COMPRESSION_LEVEL
 
-def insert_job_description(db: Session, job_text: str) -> dict:
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _dialect_insert(db: AsyncSession, model):
+    # Picks the dialect's insert, which supports ON CONFLICT clauses.
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(model)
+
+def _upsert_blobs(db: AsyncSession):
+    # Inserts blobs and, when one already exists, only pushes its expiry forward.
+    statement = _dialect_insert(db, Text_Blob)
+    return statement.on_conflict_do_update(index_elements=[Text_Blob.sha256], set_={"expires_at": statement.excluded.expires_at})
+
+async def store_text_blobs(db: AsyncSession, texts: Iterable[str]) -> List[str]:
+    # Stores each distinct text once, compressed, and returns the hash of every text in order. Does not commit.
+    texts = list(texts)
+    hashes = [text_hash(text) for text in texts]
+    by_hash = dict(zip(hashes, texts))
+    if not by_hash:
+        return hashes
+
+    # Outlives every row that can reference it: a resume or a parse-cache entry stored now.
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=max(EXPIRY_HOURS, PARSE_CACHE_EXPIRY_HOURS))
+
+    existing = set((await db.execute(select(Text_Blob.sha256).where(Text_Blob.sha256.in_(by_hash)))).scalars())
+    if existing:
+        await db.execute(update(Text_Blob).where(Text_Blob.sha256.in_(existing)).values(expires_at=expires_at))
+
+    # Compresses only the texts not stored yet.
+    new_blobs = [
+        {"sha256": sha256, "data": zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL), "size": len(text.encode("utf-8")), "expires_at": expires_at}
+        for sha256, text in by_hash.items() if sha256 not in existing
+    ]
+    if new_blobs:
+        await db.execute(_upsert_blobs(db), new_blobs)
+
+    return hashes
+
+async def load_texts(db: AsyncSession, hashes: Iterable[str]) -> dict:
+    hashes = set(h for h in hashes if h)
+    if not hashes:
+        return {}
+
+    rows = await db.execute(select(Text_Blob.sha256, Text_Blob.data).where(Text_Blob.sha256.in_(hashes)))
+    return {sha256: zlib.decompress(data).decode("utf-8") for sha256, data in rows}
+
+def _missing_features(resume: dict) -> bool:
+    return resume.get("noun_phrases") is None or resume.get("contact_info") is None
+
+async def _attach_texts(db: AsyncSession, rows: List[dict], needs_text: Callable[[dict], bool] = lambda row: True) -> List[dict]:
+    # Decompresses blob-backed text only for the rows that need it; the others keep an empty text.
+    pending = [row for row in rows if row.get("text_hash") and needs_text(row)]
+    texts = await load_texts(db, (row["text_hash"] for row in pending))
+    for row in pending:
+        row["text"] = texts.get(row["text_hash"], "")
+
+    return rows
+
+async def insert_job_description(db: AsyncSession, job_text: str, features: Optional[dict] = None) -> dict:
     try:
         job_id = str(uuid4())
         expires_at = datetime.now(timezone.utc) + timedelta(hours=EXPIRY_HOURS)
+        features = features or {}
 
-        job = Job_Description(id=job_id, text=job_text, expires_at=expires_at)
+        job = Job_Description(
+            id=job_id,
+            text=job_text,
+            skills=features.get("skills"),
+            skills_taxonomy_version=features.get("skills_taxonomy_version"),
+            noun_phrases=features.get("noun_phrases"),
+            required_years=features.get("required_years"),
+            expires_at=expires_at
+        )
         db.add(job)
-        db.commit()
-        db.refresh(job)
+        await db.commit()
 
         return {
             "id": job.id,
@@ -23,11 +101,25 @@ def insert_job_description(db: Session, job_text: str) -> dict:
             "expires_at": job.expires_at.isoformat()
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
+        raise
+
+async def update_job_skills(db: AsyncSession, job_id: str, skills: dict, taxonomy_version: str) -> None:
+    try:
+        await db.execute(
+            update(Job_Description)
+            .where(Job_Description.id == job_id)
+            .values(skills=skills, skills_taxonomy_version=taxonomy_version)
+        )
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        print(f"Unexpected error in update_job_skills for job_id {job_id}: {e}")
         raise
 
-def insert_resumes(db: Session, job_id: str, resumes: List[dict]) -> List[str]:
+async def insert_resumes(db: AsyncSession, job_id: str, resumes: List[dict], chunk_size: Optional[int] = None) -> List[str]:
     resume_ids = []
+    chunk_size = max(1, chunk_size or INSERT_CHUNK_SIZE)
 
     try:
         if not resumes:
@@ -35,57 +127,445 @@ def insert_resumes(db: Session, job_id: str, resumes: List[dict]) -> List[str]:
 
         expires_at = datetime.now(timezone.utc) + timedelta(hours=EXPIRY_HOURS)
 
-        for res in resumes:
-            resume = Resume(
-                uuid=res["uuid"],
-                job_id=job_id,
-                filename=res["filename"],
-                text=res["text"],
-                skills=res.get("skills", {}),
-                experience=res.get("experience", {}),
-                education=res.get("education", {}),
-                contact=res.get("contact", {}),
-                expires_at=expires_at
+        for start in range(0, len(resumes), chunk_size):
+            chunk = resumes[start:start + chunk_size]
+            hashes = await store_text_blobs(db, [res["text"] for res in chunk])
+
+            # Sends each chunk as one executemany INSERT (multi-row VALUES where the driver supports it),
+            # skipping the per-object unit-of-work bookkeeping of db.add.
+            await db.execute(insert(Resume), [
+                {
+                    "uuid": res["uuid"],
+                    "job_id": job_id,
+                    "filename": res["filename"],
+                    "text": "",
+                    "text_hash": sha256,
+                    "skills": res.get("skills", {}),
+                    "skill_bits": res.get("skill_bits"),
+                    "experience": res.get("experience", {}),
+                    "education": res.get("education", {}),
+                    "contact": res.get("contact", {}),
+                    "noun_phrases": res.get("noun_phrases"),
+                    "contact_info": res.get("contact_info"),
+                    "expires_at": expires_at
+                }
+                for res, sha256 in zip(chunk, hashes)
+            ])
+            await db.execute(insert(Job_Application), [{"job_id": job_id, "resume_uuid": res["uuid"]} for res in chunk])
+
+            # Marks the job's stored ranking as stale now that its resume set has changed.
+            await db.execute(
+                update(Job_Description)
+                .where(Job_Description.id == job_id)
+                .values(resume_set_version=Job_Description.resume_set_version + 1)
             )
-            db.add(resume)
-            resume_ids.append(res["uuid"])
 
-        db.commit()
+            # Commits per chunk, so a large upload never holds one long transaction; earlier chunks stay stored on failure.
+            await db.commit()
+            resume_ids.extend(res["uuid"] for res in chunk)
 
         return resume_ids
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Unexpected error in insert_resumes for job_id {job_id}: {e}")
         raise
 
-def get_job_and_resumes(db: Session, job_id: str) -> tuple[str, list[dict]]:
-    job = db.query(Job_Description).filter(Job_Description.id == job_id).first()
-    if not job:
-        return "", []
-
-    resumes = db.query(Resume).filter(Resume.job_id == job_id).all()
-
-    resume_list = []
-    for r in resumes:
-        resume_dict = {
-            "uuid": r.uuid,
-            "filename": r.filename,
-            "text": r.text,
-            "skills": r.skills or {},
-            "experience": r.experience or {},
-            "education": r.education or {},
-            "contact": r.contact or {}
+async def attach_resumes(db: AsyncSession, job_id: str, resume_uuids: List[str]) -> dict:
+    # Adds already stored resumes to a job's pool, reusing their parse results and features instead of re-uploading them.
+    try:
+        job = await db.get(Job_Description, job_id)
+        if not job:
+            return {}
+
+        resume_uuids = list(dict.fromkeys(resume_uuids))
+        found = set((await db.execute(select(Resume.uuid).where(Resume.uuid.in_(resume_uuids)))).scalars())
+        applied = set((await db.execute(select(Job_Application.resume_uuid).where(
+            Job_Application.job_id == job_id,
+            Job_Application.resume_uuid.in_(found)
+        ))).scalars())
+        attached = [resume_uuid for resume_uuid in resume_uuids if resume_uuid in found and resume_uuid not in applied]
+
+        if attached:
+            await db.execute(insert(Job_Application), [{"job_id": job_id, "resume_uuid": resume_uuid} for resume_uuid in attached])
+
+            # Keeps each attached resume at least as long as the job it now applies to.
+            await db.execute(
+                update(Resume)
+                .where(Resume.uuid.in_(attached), Resume.expires_at < job.expires_at)
+                .values(expires_at=job.expires_at)
+            )
+            await db.execute(
+                update(Job_Description)
+                .where(Job_Description.id == job_id)
+                .values(resume_set_version=Job_Description.resume_set_version + 1)
+            )
+        await db.commit()
+
+        return {
+            "attached": attached,
+            "already_attached": [resume_uuid for resume_uuid in resume_uuids if resume_uuid in applied],
+            "not_found": [resume_uuid for resume_uuid in resume_uuids if resume_uuid not in found]
         }
-        resume_list.append(resume_dict)
+    except Exception as e:
+        await db.rollback()
+        print(f"Unexpected error in attach_resumes for job_id {job_id}: {e}")
+        raise
+
+async def backfill_job_applications(db: AsyncSession) -> int:
+    # Gives resumes stored before job_applications existed an application for the job they were uploaded for.
+    result = await db.execute(
+        insert(Job_Application).from_select(
+            ["job_id", "resume_uuid"],
+            select(Resume.job_id, Resume.uuid).where(
+                Resume.job_id.is_not(None),
+                ~select(Job_Application.resume_uuid).where(Job_Application.resume_uuid == Resume.uuid).exists()
+            )
+        )
+    )
+    await db.commit()
+    return result.rowcount
+
+def _job_to_dict(job: Job_Description) -> dict:
+    return {
+        "id": job.id,
+        "text": job.text,
+        "skills": job.skills,
+        "skills_taxonomy_version": job.skills_taxonomy_version,
+        "noun_phrases": job.noun_phrases,
+        "required_years": job.required_years,
+        "resume_set_version": job.resume_set_version or 0,
+        "ranked_version": job.ranked_version,
+        "ranked_taxonomy_version": job.ranked_taxonomy_version
+    }
+
+def _resume_to_dict(r: Resume) -> dict:
+    return {
+        "uuid": r.uuid,
+        "filename": r.filename,
+        "text": r.text,
+        "text_hash": r.text_hash,
+        "skills": r.skills or {},
+        "experience": r.experience or {},
+        "education": r.education or {},
+        "contact": r.contact or {},
+        "noun_phrases": r.noun_phrases,
+        "contact_info": r.contact_info
+    }
+
+async def get_job(db: AsyncSession, job_id: str) -> dict:
+    job = await db.get(Job_Description, job_id)
+    return _job_to_dict(job) if job else {}
+
+async def get_resume(db: AsyncSession, job_id: str, resume_uuid: str) -> dict:
+    # Loads a single resume by primary key, scoped to the jobs it applies to.
+    resume = await db.get(Resume, resume_uuid)
+    if not resume or not await db.get(Job_Application, (job_id, resume_uuid)):
+        return {}
+
+    return (await _attach_texts(db, [_resume_to_dict(resume)], _missing_features))[0]
+
+def _job_pool(query, job_id: str):
+    return query.join(Job_Application, Job_Application.resume_uuid == Resume.uuid).where(Job_Application.job_id == job_id)
+
+async def iter_resume_batches(db: AsyncSession, job_id: str, unranked_only: bool = False, batch_size: Optional[int] = None) -> AsyncIterator[List[dict]]:
+    batch_size = max(1, batch_size or STREAM_BATCH_SIZE)
+
+    # Selects only the columns scoring reads, skipping the text and the parser's education and contact JSON.
+    query = _job_pool(select(Resume.uuid, Resume.filename, Resume.skills, Resume.skill_bits, Resume.experience, Resume.noun_phrases, Resume.text_hash), job_id)
+    if unranked_only:
+        # Limits to the job's resumes that have no row in its stored ranking yet.
+        query = query.where(Resume.uuid.not_in(select(Ranked_Result.resume_uuid).where(Ranked_Result.job_id == job_id)))
+
+    # Streams the rows batch_size at a time (a server-side cursor on Postgres) instead of loading the whole pool.
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        resumes = [
+            {
+                "uuid": row.uuid,
+                "filename": row.filename,
+                "skills": row.skills or {},
+                "skill_bits": row.skill_bits,
+                "experience": row.experience or {},
+                "noun_phrases": row.noun_phrases,
+                "text_hash": row.text_hash
+            }
+            for row in partition
+        ]
+
+        # Fetches the text only for resumes stored without noun phrases, which the scorer has to compute from it.
+        yield await _attach_needed_texts(db, resumes, lambda r: r["noun_phrases"] is None)
 
-    return job.text, resume_list
+async def _attach_needed_texts(db: AsyncSession, resumes: List[dict], needs_text: Callable[[dict], bool]) -> List[dict]:
+    # Reads inline text for resumes stored before text_blobs existed, and decompresses the rest, only where needed.
+    missing = [r["uuid"] for r in resumes if needs_text(r) and not r["text_hash"]]
+    if missing:
+        texts = dict((await db.execute(select(Resume.uuid, Resume.text).where(Resume.uuid.in_(missing)))).all())
+        for resume in resumes:
+            if resume["uuid"] in texts:
+                resume["text"] = texts[resume["uuid"]]
+    return await _attach_texts(db, resumes, needs_text)
 
-def cleanup_old_data(db: Session, current_time: datetime) -> dict:
-    deleted_resumes = db.query(Resume).filter(Resume.expires_at <= current_time).delete()
-    deleted_jobs = db.query(Job_Description).filter(Job_Description.expires_at <= current_time).delete()
-    db.commit()
+async def get_resumes_by_uuid(db: AsyncSession, resume_uuids: List[str]) -> List[dict]:
+    # Selects only what decorating a ranked page reads; callers pass at most a page of uuids, keeping the IN list
+    # well under the driver's bind parameter limit.
+    if not resume_uuids:
+        return []
+
+    rows = await db.execute(
+        select(Resume.uuid, Resume.skills, Resume.contact_info, Resume.text_hash).where(Resume.uuid.in_(resume_uuids))
+    )
+    resumes = [
+        {"uuid": row.uuid, "skills": row.skills or {}, "contact_info": row.contact_info, "text_hash": row.text_hash}
+        for row in rows
+    ]
+
+    # The text is only needed to extract contact details for resumes stored without them.
+    return await _attach_needed_texts(db, resumes, lambda r: r["contact_info"] is None)
+
+async def store_ranked_results(db: AsyncSession, job_id: str, ranked: List[dict], version: Tuple[int, str],
+                               previous_version: Tuple[Optional[int], Optional[str]], replace: bool = True) -> bool:
+    # Versions are (resume_set_version, taxonomy version) pairs. Stores the ranking only if the job's ranked versions
+    # are still the ones it was computed from; returns False, storing nothing, when a concurrent rank got there first.
+    try:
+        # Claims the job first: the update locks its row, so a concurrent writer waits and then fails this check.
+        claimed = await db.execute(
+            update(Job_Description)
+            .where(
+                Job_Description.id == job_id,
+                Job_Description.ranked_version.is_not_distinct_from(previous_version[0]),
+                Job_Description.ranked_taxonomy_version.is_not_distinct_from(previous_version[1])
+            )
+            .values(ranked_version=version[0], ranked_taxonomy_version=version[1])
+        )
+        if claimed.rowcount == 0:
+            await db.rollback()
+            return False
+
+        if replace:
+            # Replaces the job's previous ranking; rows are stored in ranked order so seq preserves tie order.
+            await db.execute(delete(Ranked_Result).where(Ranked_Result.job_id == job_id))
+            next_seq = 0
+        else:
+            # Appends after the stored rows, so new rows sort after stored rows with the same score.
+            max_seq = await db.scalar(select(func.max(Ranked_Result.seq)).where(Ranked_Result.job_id == job_id))
+            next_seq = 0 if max_seq is None else max_seq + 1
+
+        if ranked:
+            # Skips a resume the job's ranking already holds instead of storing it twice.
+            statement = _dialect_insert(db, Ranked_Result).on_conflict_do_nothing(
+                index_elements=[Ranked_Result.job_id, Ranked_Result.resume_uuid]
+            )
+            await db.execute(statement, [
+                {
+                    "job_id": job_id,
+                    "resume_uuid": row["uuid"],
+                    "seq": seq,
+                    "skill_score": row["skill_score"],
+                    "text_score": row["text_score"],
+                    "experience_score": row["experience_score"],
+                    "combined_score": row["combined_score"],
+                    "experience_years": row.get("experience_years", 0)
+                }
+                for seq, row in enumerate(ranked, start=next_seq)
+            ])
+
+        await db.commit()
+        return True
+    except Exception as e:
+        await db.rollback()
+        print(f"Unexpected error in store_ranked_results for job_id {job_id}: {e}")
+        raise
+
+async def count_ranked_results(db: AsyncSession, job_id: str) -> int:
+    return await db.scalar(select(func.count()).select_from(Ranked_Result).where(Ranked_Result.job_id == job_id))
+
+def _ranked_query(job_id: str):
+    return (
+        select(Ranked_Result, Resume.filename)
+        .join(Resume, Resume.uuid == Ranked_Result.resume_uuid)
+        .where(Ranked_Result.job_id == job_id)
+        .order_by(Ranked_Result.combined_score.desc(), Ranked_Result.seq)
+    )
+
+def _ranked_to_dict(result: Ranked_Result, filename: str) -> dict:
+    return {
+        "uuid": result.resume_uuid,
+        "filename": filename,
+        "skill_score": result.skill_score,
+        "text_score": result.text_score,
+        "experience_score": result.experience_score,
+        "combined_score": result.combined_score,
+        "experience_years": result.experience_years
+    }
+
+async def get_ranked_results(db: AsyncSession, job_id: str, limit: Optional[int] = None, offset: int = 0) -> List[dict]:
+    query = _ranked_query(job_id).offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+
+    return [_ranked_to_dict(result, filename) for result, filename in await db.execute(query)]
+
+async def iter_ranked_results(db: AsyncSession, job_id: str, page_size: int, limit: Optional[int] = None) -> AsyncIterator[List[dict]]:
+    # Reads the whole stored ranking, up to limit rows, a page at a time. Each page continues from the last row's
+    # (combined_score, seq) instead of an OFFSET, so it seeks in the ranking index rather than re-reading every earlier row.
+    remaining = limit
+    after = None
+    while remaining is None or remaining > 0:
+        query = _ranked_query(job_id).limit(page_size if remaining is None else min(page_size, remaining))
+        if after is not None:
+            score, seq = after
+            # The first condition bounds the index range; the second skips the rows already read at the same score.
+            query = query.where(
+                Ranked_Result.combined_score <= score,
+                or_(Ranked_Result.combined_score < score, Ranked_Result.seq > seq)
+            )
+
+        rows = (await db.execute(query)).all()
+        if not rows:
+            return
+
+        last = rows[-1][0]
+        after = (last.combined_score, last.seq)
+        if remaining is not None:
+            remaining -= len(rows)
+        yield [_ranked_to_dict(result, filename) for result, filename in rows]
+
+async def get_parsed_documents(db: AsyncSession, hashes: List[str]) -> dict:
+    if not hashes:
+        return {}
+
+    documents = (await db.execute(select(Parsed_Document).where(
+        Parsed_Document.sha256.in_(hashes),
+        Parsed_Document.expires_at > datetime.now(timezone.utc)
+    ))).scalars().all()
+
+    # Ingestion re-extracts skills from every cached text, so all of them are decompressed here.
+    texts = await load_texts(db, (d.text_hash for d in documents))
 
     return {
-        "deleted_job_descriptions": deleted_jobs,
-        "deleted_resumes": deleted_resumes
-    }
\ No newline at end of file
+        d.sha256: {
+            "text": texts.get(d.text_hash, "") if d.text_hash else d.text,
+            "skills": d.skills or {},
+            "experience": d.experience or {},
+            "education": d.education or {},
+            "contact": d.contact or {},
+            "noun_phrases": d.noun_phrases,
+            "contact_info": d.contact_info
+        }
+        for d in documents
+    }
+
+async def insert_parsed_documents(db: AsyncSession, documents: dict) -> None:
+    try:
+        expires_at = datetime.now(timezone.utc) + timedelta(hours=PARSE_CACHE_EXPIRY_HOURS)
+        hashes = await store_text_blobs(db, [doc["text"] for doc in documents.values()])
+
+        for (sha256, doc), blob_hash in zip(documents.items(), hashes):
+            # Merges so an expired entry (or one stored by a concurrent upload) is refreshed instead of conflicting.
+            await db.merge(Parsed_Document(
+                sha256=sha256,
+                text="",
+                text_hash=blob_hash,
+                skills=doc.get("skills", {}),
+                experience=doc.get("experience", {}),
+                education=doc.get("education", {}),
+                contact=doc.get("contact", {}),
+                noun_phrases=doc.get("noun_phrases"),
+                contact_info=doc.get("contact_info"),
+                expires_at=expires_at
+            ))
+
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        print(f"Unexpected error in insert_parsed_documents: {e}")
+        raise
+
+async def _delete_batch(db: AsyncSession, select_ids, delete_statements) -> int:
+    # Deletes one bounded batch of ids in its own short transaction, returning how many ids it covered.
+    ids = (await db.execute(select_ids)).scalars().all()
+    if ids:
+        for statement in delete_statements(ids):
+            await db.execute(statement)
+    await db.commit()
+    return len(ids)
+
+async def cleanup_old_data(db: AsyncSession, current_time: datetime, batch_size: Optional[int] = None) -> dict:
+    batch_size = max(1, batch_size or CLEANUP_BATCH_SIZE)
+    counts = {"deleted_resumes": 0, "deleted_parsed_documents": 0, "deleted_text_blobs": 0, "deleted_job_descriptions": 0}
+    batches = 0
+
+    try:
+        expired_jobs = select(Job_Description.id).where(Job_Description.expires_at <= current_time)
+
+        # Deletes resumes first (expired ones, and ones no live job's pool includes anymore) along with their
+        # applications and stored rankings; a resume shared with a live job survives its other jobs expiring.
+        live_application = (
+            select(Job_Application.resume_uuid)
+            .join(Job_Description, Job_Description.id == Job_Application.job_id)
+            .where(Job_Application.resume_uuid == Resume.uuid, Job_Description.expires_at > current_time)
+        )
+        expired_resumes = (
+            select(Resume.uuid)
+            .where((Resume.expires_at <= current_time) | ~live_application.exists())
+            .limit(batch_size)
+        )
+        while True:
+            deleted = await _delete_batch(db, expired_resumes, lambda ids: (
+                delete(Ranked_Result).where(Ranked_Result.resume_uuid.in_(ids)),
+                delete(Job_Application).where(Job_Application.resume_uuid.in_(ids)),
+                delete(Resume).where(Resume.uuid.in_(ids))
+            ))
+            counts["deleted_resumes"] += deleted
+            batches += 1
+            if deleted < batch_size:
+                break
+
+        expired_documents = select(Parsed_Document.sha256).where(Parsed_Document.expires_at <= current_time).limit(batch_size)
+        while True:
+            deleted = await _delete_batch(db, expired_documents, lambda ids: (
+                delete(Parsed_Document).where(Parsed_Document.sha256.in_(ids)),
+            ))
+            counts["deleted_parsed_documents"] += deleted
+            batches += 1
+            if deleted < batch_size:
+                break
+
+        # Keeps a blob while any resume or cached parse still references it, even past its own expiry.
+        orphaned_blobs = (
+            select(Text_Blob.sha256)
+            .where(
+                Text_Blob.expires_at <= current_time,
+                ~select(Resume.uuid).where(Resume.text_hash == Text_Blob.sha256).exists(),
+                ~select(Parsed_Document.sha256).where(Parsed_Document.text_hash == Text_Blob.sha256).exists()
+            )
+            .limit(batch_size)
+        )
+        while True:
+            deleted = await _delete_batch(db, orphaned_blobs, lambda ids: (
+                delete(Text_Blob).where(Text_Blob.sha256.in_(ids)),
+            ))
+            counts["deleted_text_blobs"] += deleted
+            batches += 1
+            if deleted < batch_size:
+                break
+
+        # Resumes that outlive the job keep their other applications and only lose the reference to where they were uploaded.
+        deletable_jobs = expired_jobs.limit(batch_size)
+        while True:
+            deleted = await _delete_batch(db, deletable_jobs, lambda ids: (
+                delete(Ranked_Result).where(Ranked_Result.job_id.in_(ids)),
+                delete(Job_Application).where(Job_Application.job_id.in_(ids)),
+                update(Resume).where(Resume.job_id.in_(ids)).values(job_id=None),
+                delete(Job_Description).where(Job_Description.id.in_(ids))
+            ))
+            counts["deleted_job_descriptions"] += deleted
+            batches += 1
+            if deleted < batch_size:
+                break
+    except Exception as e:
+        await db.rollback()
+        print(f"Unexpected error in cleanup_old_data: {e}")
+        raise
+
+    return {**counts, "batches": batches}
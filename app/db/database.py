@@ -1,13 +1,40 @@
 import config
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-# create_engine is used to talk to DB and handle connections
-engine = create_engine(config.DATABASE_URL, pool_pre_ping=True)
+# Swaps the configured driver for its asyncio counterpart, e.g. postgresql:// -> postgresql+asyncpg://
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
 
-# Create a factory for database sessions, which performs common operations
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _async_url(url: str):
+    url = make_url(url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}") if driver else url
+
+def _engine_options(url) -> dict:
+    options = {"pool_pre_ping": True}
+
+    # SQLite has no server-side pool or statement timeout to configure.
+    if url.get_backend_name() != "sqlite":
+        options.update(pool_size=config.DB_POOL_SIZE, max_overflow=config.DB_MAX_OVERFLOW, pool_timeout=config.DB_POOL_TIMEOUT)
+        if config.DB_STATEMENT_TIMEOUT_MS > 0 and url.get_backend_name() == "postgresql":
+            # Aborts any statement running longer than the timeout, so one slow query can't hold a pooled connection.
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)}}
+
+    return options
+
+database_url = _async_url(config.DATABASE_URL)
+
+# create_async_engine is used to talk to DB and handle connections without blocking the event loop
+engine = create_async_engine(database_url, **_engine_options(database_url))
+
+# Create a factory for database sessions; objects stay readable after commit, since lazy loads can't run implicitly
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # Base model
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+async def get_db():
+    # FastAPI dependency shared by every router: one session per request, closed when the request is done.
+    async with SessionLocal() as db:
+        yield db
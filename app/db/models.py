@@ -1,25 +1,99 @@
 from sqlalchemy.sql import func
 from app.db.database import Base
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, JSON, Integer, Float, Index, LargeBinary
 
 class Job_Description(Base):
     __tablename__ = 'job_descriptions'
 
     id = Column(String, primary_key=True, index=True)
     text = Column(Text, nullable=False)
+    skills = Column(JSON, nullable=True)
+    # Version of the skill taxonomy the skills were extracted with; they are extracted again once it changes.
+    skills_taxonomy_version = Column(String, nullable=True)
+    noun_phrases = Column(JSON, nullable=True)
+    required_years = Column(Integer, nullable=True)
+    # Bumped whenever resumes are added; the stored ranking is current only when ranked_version matches it.
+    resume_set_version = Column(Integer, nullable=False, default=0, server_default="0")
+    ranked_version = Column(Integer, nullable=True)
+    # Version of the skill taxonomy the stored ranking was scored with; a different one needs a full re-rank.
+    ranked_taxonomy_version = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+class Text_Blob(Base):
+    __tablename__ = 'text_blobs'
+
+    # SHA-256 of the UTF-8 text, so identical texts are stored once however many rows reference them.
+    sha256 = Column(String(64), primary_key=True)
+    # zlib-compressed UTF-8 text.
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    expires_at = Column(DateTime(timezone=True), nullable=False)
+    # Pushed forward whenever a row references the blob; unreferenced blobs are deleted once it passes.
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
 
 class Resume(Base):
     __tablename__ = 'resumes'
 
     uuid = Column(String, primary_key=True, index=True)
-    job_id = Column(String, ForeignKey("job_descriptions.id"), nullable=False)
+    # The job the resume was first uploaded for; the jobs it is ranked for are its job_applications rows.
+    job_id = Column(String, ForeignKey("job_descriptions.id"), nullable=True, index=True)
     filename = Column(String, nullable=False)
+    # Empty when the text is stored in text_blobs; rows stored before text_hash existed keep it inline.
+    text = Column(Text, nullable=False)
+    text_hash = Column(String(64), ForeignKey("text_blobs.sha256"), nullable=True, index=True)
+    skills = Column(JSON, nullable=True)
+    # The skills as taxonomy bits (SkillTaxonomy.encode), so ranking builds its skill matrix without resolving names.
+    skill_bits = Column(Text, nullable=True)
+    experience = Column(JSON, nullable=True)
+    education = Column(JSON, nullable=True)
+    contact = Column(JSON, nullable=True)
+    noun_phrases = Column(JSON, nullable=True)
+    contact_info = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+class Job_Application(Base):
+    __tablename__ = 'job_applications'
+
+    # Links a stored resume to every job it is ranked for, so one parsed candidate can apply to many jobs.
+    job_id = Column(String, ForeignKey("job_descriptions.id"), primary_key=True)
+    resume_uuid = Column(String, ForeignKey("resumes.uuid"), primary_key=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class Ranked_Result(Base):
+    __tablename__ = 'ranked_results'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(String, ForeignKey("job_descriptions.id"), nullable=False)
+    resume_uuid = Column(String, ForeignKey("resumes.uuid"), nullable=False, index=True)
+    # Order in which rows were stored, used to keep ties in the same order as the original sort.
+    seq = Column(Integer, nullable=False)
+    skill_score = Column(Float, nullable=False)
+    text_score = Column(Float, nullable=False)
+    experience_score = Column(Float, nullable=False)
+    combined_score = Column(Float, nullable=False)
+    experience_years = Column(Float, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+# Matches the directions of the ranking read (combined_score DESC, seq ASC), so the index serves the sort itself.
+Index('ix_ranked_results_job_rank', Ranked_Result.job_id, Ranked_Result.combined_score.desc(), Ranked_Result.seq)
+# A resume appears at most once in a job's ranking, even when two rank requests store it concurrently.
+Index('uq_ranked_results_job_resume', Ranked_Result.job_id, Ranked_Result.resume_uuid, unique=True)
+
+class Parsed_Document(Base):
+    __tablename__ = 'parsed_documents'
+
+    # SHA-256 of the uploaded file bytes.
+    sha256 = Column(String(64), primary_key=True)
+    # Empty when the text is stored in text_blobs.
     text = Column(Text, nullable=False)
+    text_hash = Column(String(64), ForeignKey("text_blobs.sha256"), nullable=True, index=True)
     skills = Column(JSON, nullable=True)
     experience = Column(JSON, nullable=True)
     education = Column(JSON, nullable=True)
     contact = Column(JSON, nullable=True)
+    noun_phrases = Column(JSON, nullable=True)
+    contact_info = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    expires_at = Column(DateTime(timezone=True), nullable=False)
\ No newline at end of file
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,77 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+# Imported from models so every table is registered on the metadata.
+from app.db.models import Base
+
+# Indexes an earlier version created that a later one replaced.
+OBSOLETE_INDEXES = {
+    # Declared all ascending, so it couldn't serve the ranking's combined_score DESC, seq ASC order.
+    "ranked_results": ["ix_ranked_results_job_order"]
+}
+
+def _rebuild_sqlite_table(connection, table, columns) -> None:
+    # SQLite can't change a column's constraints in place, so the rows are copied into a table created from the model.
+    copy = f"_{table.name}_old"
+    names = ", ".join(f'"{name}"' for name in columns)
+
+    connection.execute(text(f'CREATE TABLE "{copy}" AS SELECT * FROM "{table.name}"'))
+    connection.execute(text(f'DROP TABLE "{table.name}"'))
+    table.create(bind=connection)
+    connection.execute(text(f'INSERT INTO "{table.name}" ({names}) SELECT {names} FROM "{copy}"'))
+    connection.execute(text(f'DROP TABLE "{copy}"'))
+
+def _drop_duplicates(connection, table, index) -> None:
+    # Keeps the first row stored for each key, so a unique index added to an existing table can be created.
+    # Only ranked_results gets one, and it is a cache that the next rank rebuilds.
+    (key,) = table.primary_key.columns
+    columns = ", ".join(f'"{column.name}"' for column in index.columns)
+    connection.execute(text(
+        f'DELETE FROM "{table.name}" WHERE "{key.name}" NOT IN '
+        f'(SELECT MIN("{key.name}") FROM "{table.name}" GROUP BY {columns})'
+    ))
+
+def upgrade_schema(connection) -> None:
+    # Brings tables created by an earlier version up to the models: adds missing columns and drops NOT NULL
+    # where a column has become optional, and clears rows that would break a new unique index. create_all never
+    # alters a table that already exists.
+    inspector = inspect(connection)
+    dialect = connection.dialect
+
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {column["name"]: column for column in inspector.get_columns(table.name)}
+        missing = [column for column in table.columns if column.name not in existing]
+        relaxed = [column for column in table.columns
+                   if column.name in existing and column.nullable and not existing[column.name]["nullable"]]
+
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.unique and index.name not in existing_indexes and all(column.name in existing for column in index.columns):
+                _drop_duplicates(connection, table, index)
+
+        if relaxed and dialect.name == "sqlite":
+            # The copy also adds the missing columns, filled with their defaults.
+            _rebuild_sqlite_table(connection, table, [column.name for column in table.columns if column.name in existing])
+            continue
+
+        for column in missing:
+            # Renders the column as CREATE TABLE would; NOT NULL columns need a server default to fill existing rows.
+            connection.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN {CreateColumn(column).compile(dialect=dialect)}'))
+
+        for column in relaxed:
+            connection.execute(text(f'ALTER TABLE "{table.name}" ALTER COLUMN "{column.name}" DROP NOT NULL'))
+
+        for name in OBSOLETE_INDEXES.get(table.name, []):
+            if name in existing_indexes:
+                connection.execute(text(f'DROP INDEX "{name}"'))
+
+def create_schema(connection) -> None:
+    Base.metadata.create_all(bind=connection)
+    upgrade_schema(connection)
+
+    # create_all skips tables that already exist, so indexes added to existing tables are created here.
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=connection, checkfirst=True)
@@ -1,13 +1,46 @@
+import config
 from fastapi import FastAPI
-from app.db.database import Base, engine
+from contextlib import asynccontextmanager
+from app.db.schema import create_schema
+from app.db.database import engine, SessionLocal
+from app.db.crud import backfill_job_applications
+from app.utils.nlp_registry import load_scorer, get_model_stats
+from app.utils.parse_pool import start_parse_pool, shutdown_parse_pool
+from app.utils.uploads import UploadSizeLimitMiddleware, upload_limit
+from app.utils.cleanup_scheduler import start_cleanup_scheduler, stop_cleanup_scheduler
 
-from app.api.router_resume import router as ResumeRouter
+from app.api.router_resume import router as ResumeRouter, cancel_archive_ingestions
 from app.api.router_ranker import router as RankerRouter
 from app.api.router_cleanup import router as CleanRouter
 
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Creates any missing tables, columns and indexes before serving.
+    async with engine.begin() as connection:
+        await connection.run_sync(create_schema)
+    # Puts resumes stored before job_applications existed into the pool of the job they were uploaded for.
+    async with SessionLocal() as db:
+        await backfill_job_applications(db)
+    # Loads the spaCy model once per worker process before any request is served.
+    load_scorer()
+    # Starts the resume parsing workers up front so the first upload doesn't pay for their startup.
+    start_parse_pool()
+    # Deletes expired rows in bounded batches every CLEANUP_INTERVAL_SECONDS.
+    start_cleanup_scheduler()
+    yield
+    await stop_cleanup_scheduler()
+    # Cancels archive ingestions still running, so none is cut off midway by the pool or engine shutting down.
+    await cancel_archive_ingestions()
+    shutdown_parse_pool()
+    await engine.dispose()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+
+# Rejects oversized uploads before their body is spooled; archives are spooled to disk and have no limit here.
+app.add_middleware(UploadSizeLimitMiddleware, limits={
+    '/resumes/upload-resume/': upload_limit(config.MAX_RESUME_MB, config.MAX_RESUME_FILES),
+    '/ranker/upload-job-description/': upload_limit(config.MAX_JOB_DESCRIPTION_MB)
+})
 
 app.include_router(ResumeRouter, prefix='/resumes')
 app.include_router(RankerRouter, prefix='/ranker')
@@ -15,4 +48,8 @@ app.include_router(CleanRouter, prefix='/clean')
 
 @app.get("/")
 async def read_root():
-    return {"message": "FastAPI application is running!"}
\ No newline at end of file
+    return {"message": "FastAPI application is running!"}
+
+@app.get("/model-info")
+async def model_info():
+    return get_model_stats()
@@ -0,0 +1,54 @@
+import os
+import tarfile
+import zipfile
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+def detect_archive_format(archive_file: BinaryIO) -> str:
+    # Checks a seekable binary file and rewinds it afterwards.
+    try:
+        if zipfile.is_zipfile(archive_file):
+            return "zip"
+        archive_file.seek(0)
+        if tarfile.is_tarfile(archive_file):
+            return "tar"
+        return ""
+    finally:
+        archive_file.seek(0)
+
+def _is_resume(name: str) -> bool:
+    # Skips folders' metadata (e.g. __MACOSX/, ._ files) and anything that isn't a PDF.
+    basename = os.path.basename(name)
+    return name.lower().endswith(".pdf") and not basename.startswith(".") and "__MACOSX/" not in name
+
+def iter_archive_members(archive_file: BinaryIO, max_member_bytes: int) -> Iterator[Tuple[str, Optional[bytes]]]:
+    # Yields one (filename, bytes) pair at a time, so only the current member is ever held in memory.
+    # Oversized members yield None instead of their bytes, so callers can report them as failed.
+    fmt = detect_archive_format(archive_file)
+
+    if fmt == "zip":
+        with zipfile.ZipFile(archive_file) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not _is_resume(info.filename):
+                    continue
+                if info.file_size > max_member_bytes:
+                    yield info.filename, None
+                    continue
+                with archive.open(info) as member:
+                    # Reads at most one byte past the limit, in case the header understates the size.
+                    data = member.read(max_member_bytes + 1)
+                yield info.filename, data if len(data) <= max_member_bytes else None
+
+    elif fmt == "tar":
+        # Opens the tar in stream mode, so members are read strictly in order without seeking.
+        with tarfile.open(fileobj=archive_file, mode="r|*") as archive:
+            for info in archive:
+                if not info.isfile() or not _is_resume(info.name):
+                    continue
+                if info.size > max_member_bytes:
+                    yield info.name, None
+                    continue
+                member = archive.extractfile(info)
+                yield info.name, member.read() if member else None
+
+    else:
+        raise ValueError("Unsupported archive format; expected a ZIP or tar file.")
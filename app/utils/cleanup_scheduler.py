@@ -0,0 +1,77 @@
+import time
+import config
+import asyncio
+from typing import Dict, Optional
+from app.db import crud
+from datetime import datetime, timezone
+from app.db.database import SessionLocal
+
+_task: Optional[asyncio.Task] = None
+_stats: Dict = {
+    "runs": 0,
+    "errors": 0,
+    "last_run_at": None,
+    "last_duration_seconds": None,
+    "last_result": None,
+    "last_error": None,
+    "total_seconds": 0.0,
+    "total_deleted": {"deleted_resumes": 0, "deleted_parsed_documents": 0, "deleted_text_blobs": 0, "deleted_job_descriptions": 0}
+}
+
+async def run_cleanup() -> Dict:
+    # Runs one batched cleanup pass and records how many rows it deleted and how long it took.
+    started = time.perf_counter()
+    try:
+        async with SessionLocal() as db:
+            result = await crud.cleanup_old_data(db, datetime.now(timezone.utc))
+    except Exception as e:
+        _stats["errors"] += 1
+        _stats["last_error"] = str(e)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        _stats["runs"] += 1
+        _stats["last_run_at"] = datetime.now(timezone.utc).isoformat()
+        _stats["last_duration_seconds"] = round(elapsed, 3)
+        _stats["total_seconds"] = round(_stats["total_seconds"] + elapsed, 3)
+
+    _stats["last_result"] = result
+    for key in _stats["total_deleted"]:
+        _stats["total_deleted"][key] += result.get(key, 0)
+
+    return {**result, "duration_seconds": _stats["last_duration_seconds"]}
+
+async def _run_periodically(interval: int) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # Each batch awaits the database, so requests keep being served between and during the deletes.
+            await run_cleanup()
+        except Exception as e:
+            print(f"Error in scheduled cleanup: {e}")
+
+def start_cleanup_scheduler() -> None:
+    global _task
+
+    # A non-positive interval turns the scheduler off, leaving only the /clean/cleanup/ endpoint.
+    if _task is None and config.CLEANUP_INTERVAL_SECONDS > 0:
+        _task = asyncio.create_task(_run_periodically(config.CLEANUP_INTERVAL_SECONDS))
+
+async def stop_cleanup_scheduler() -> None:
+    global _task
+
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+
+def get_cleanup_stats() -> Dict:
+    return {
+        "scheduler_running": _task is not None and not _task.done(),
+        "interval_seconds": config.CLEANUP_INTERVAL_SECONDS,
+        "batch_size": config.CLEANUP_BATCH_SIZE,
+        **_stats
+    }
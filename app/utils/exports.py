@@ -1,24 +1,48 @@
 import io
 import csv
+import itertools
 import openpyxl
 from io import BytesIO
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List
 from openpyxl.utils import get_column_letter
 
-def generate_csv_ranked_resumes(ranked_resumes_list: List[Dict]) -> bytes:
-    output = io.StringIO()
-    fieldnames = [
-        "uuid", "filename", "combined_score", "skill_score",
-        "text_score", "experience_score", "skills_found", "experience_years",
-        "contact_info"
+CSV_FIELDS = [
+    "uuid", "filename", "combined_score", "skill_score",
+    "text_score", "experience_score", "skills_found", "experience_years",
+    "email", "phone", "location"
+]
+
+def _csv_row(row: Dict) -> List:
+    # Flattens the contact details into their own columns instead of writing the dict's repr.
+    contact_info = row.get("contact_info") or {}
+    return [
+        row.get("uuid", ""),
+        row.get("filename", ""),
+        row.get("combined_score", 0),
+        row.get("skill_score", 0),
+        row.get("text_score", 0),
+        row.get("experience_score", 0),
+        row.get("skills_found", ""),
+        row.get("experience_years", 0),
+        contact_info.get("email", ""),
+        contact_info.get("phone", ""),
+        contact_info.get("location", "")
     ]
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
 
-    for row in ranked_resumes_list:
-        writer.writerow(row)
+def iter_csv_ranked_resumes(ranked_resumes: Iterable[Dict], header: bool = True) -> Iterator[bytes]:
+    # Encodes one row at a time through a small reused buffer, so memory doesn't grow with the number of rows.
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
 
-    return output.getvalue().encode("utf-8")
+    rows = (_csv_row(row) for row in ranked_resumes)
+    if header:
+        rows = itertools.chain([CSV_FIELDS], rows)
+
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
 
 def generate_excel_from_ranked_data(ranked_resumes_list: List[Dict]) -> bytes:
     wb = openpyxl.Workbook()
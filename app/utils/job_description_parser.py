@@ -1,16 +1,21 @@
+import io
 import docx
-from fastapi import UploadFile
+import fitz
+from app.utils.uploads import PDF_MIME, DOCX_MIME, TEXT_MIME
 
-def extract_text_job_file(file: UploadFile) -> str:
-    if file.filename.endswith('.docx'):
-        doc = docx.Document(file.file)
+def extract_text_job_file(data: bytes, mime: str) -> str:
+    if mime == DOCX_MIME:
+        doc = docx.Document(io.BytesIO(data))
         full_text = []
 
         for para in doc.paragraphs:
             full_text.append(para.text)
 
         return '\n'.join(full_text)
-    elif file.filename.endswith('.txt'):
-        return file.file.read().decode('utf-8')
+    elif mime == TEXT_MIME:
+        return data.decode('utf-8', errors='replace')
+    elif mime == PDF_MIME:
+        with fitz.open(stream=data, filetype="pdf") as doc:
+            return '\n'.join(page.get_text() for page in doc)
     else:
-        return "Invalid format. Upload .docx or .txt"
\ No newline at end of file
+        return "Invalid format. Upload .pdf, .docx or .txt"
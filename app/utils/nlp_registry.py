@@ -0,0 +1,60 @@
+import os
+import time
+import spacy
+import config
+import threading
+from typing import Dict, Optional
+from datetime import datetime, timezone
+from app.utils.similarity import SimilarityScorer
+
+# Guards the one-time model load so concurrent first requests don't each call spacy.load.
+_lock = threading.Lock()
+_scorer: Optional[SimilarityScorer] = None
+_model_stats: Dict = {}
+
+def _current_rss_mb() -> float:
+    # Reads the resident set size of this process, falling back to the peak RSS where /proc is unavailable.
+    try:
+        with open('/proc/self/statm') as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def load_scorer() -> SimilarityScorer:
+    global _scorer
+
+    if _scorer is not None:
+        return _scorer
+
+    with _lock:
+        # Another thread may have finished loading while this one waited on the lock.
+        if _scorer is not None:
+            return _scorer
+
+        rss_before = _current_rss_mb()
+        started = time.perf_counter()
+
+        nlp = spacy.load(config.SPACY_MODEL)
+        scorer = SimilarityScorer(nlp=nlp)
+
+        _model_stats.update({
+            'model': config.SPACY_MODEL,
+            'pipeline': list(nlp.pipe_names),
+            'load_seconds': round(time.perf_counter() - started, 3),
+            'memory_mb': round(max(0.0, _current_rss_mb() - rss_before), 1),
+            'loaded_at': datetime.now(timezone.utc).isoformat()
+        })
+        print(f"Loaded spaCy model '{config.SPACY_MODEL}' in {_model_stats['load_seconds']}s "
+              f"(~{_model_stats['memory_mb']} MB)")
+
+        _scorer = scorer
+        return _scorer
+
+def get_scorer() -> SimilarityScorer:
+    # FastAPI dependency: hands every request the process-wide scorer, loading it on first use if startup didn't.
+    return load_scorer()
+
+def get_model_stats() -> Dict:
+    return {'loaded': _scorer is not None, **_model_stats}
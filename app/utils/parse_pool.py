@@ -0,0 +1,60 @@
+import config
+import asyncio
+import threading
+import multiprocessing
+from typing import Dict, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from app.utils.resume_parser import ResumeParser
+
+# Each worker process builds its own parser once, in the pool initializer.
+_worker_parser: Optional[ResumeParser] = None
+
+_lock = threading.Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+
+def _init_worker() -> None:
+    global _worker_parser
+    _worker_parser = ResumeParser()
+
+def _parse_in_worker(source: Union[str, bytes]) -> Dict:
+    return _worker_parser.parse_resume(source)
+
+def start_parse_pool() -> ProcessPoolExecutor:
+    global _executor
+
+    with _lock:
+        if _executor is None:
+            # Spawns fresh interpreters rather than forking the server, which holds the spaCy model and live threads.
+            _executor = ProcessPoolExecutor(
+                max_workers=max(1, config.PARSE_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return _executor
+
+def shutdown_parse_pool() -> None:
+    global _executor
+
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+            _executor = None
+
+def _discard_broken_pool(executor: ProcessPoolExecutor) -> None:
+    global _executor
+
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+async def parse_resume(source: Union[str, bytes]) -> Dict:
+    # Runs PyMuPDF extraction and the regex passes in a worker process, keeping the event loop free.
+    executor = start_parse_pool()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, _parse_in_worker, source)
+    except BrokenProcessPool:
+        # A worker died (e.g. on a malformed PDF); replaces the pool so later uploads still work.
+        _discard_broken_pool(executor)
+        raise
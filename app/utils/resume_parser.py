@@ -1,122 +1,124 @@
 import re
+import time
 import fitz
-from typing import Dict, List
+from itertools import islice
 from datetime import datetime
+from typing import Callable, Dict, List, Union
+from app.utils.skill_matcher import get_skill_matcher
+from app.utils.skill_taxonomy import get_taxonomy
 
 class ResumeParser:
-    def __init__(self):
-        self.technical_skills = {
-            'programming': ['python', 'java', 'javascript', 'js', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift',
-                            'kotlin', 'scala', 'r', 'matlab', 'perl', 'bash', 'shell', 'powershell'],
-            'frameworks': ['django', 'flask', 'fastapi', 'react', 'angular', 'vue', 'spring', 'express', 'laravel',
-                           'asp.net', 'node.js', 'jquery', 'bootstrap', 'tailwind', 'material-ui', 'redux', 'vuex',
-                           'next.js', 'nuxt.js'],
-            'databases': ['mysql', 'postgresql', 'postgres', 'mongodb', 'redis', 'oracle', 'sqlite', 'sql server',
-                          'mariadb', 'cassandra', 'elasticsearch', 'dynamodb', 'firebase'],
-            'cloud': ['aws', 'amazon web services', 'azure', 'gcp', 'google cloud', 'docker', 'kubernetes', 'k8s',
-                      'terraform', 'ansible', 'jenkins', 'gitlab ci', 'github actions', 'heroku', 'digitalocean'],
-            'tools': ['git', 'github', 'gitlab', 'bitbucket', 'jira', 'confluence', 'figma', 'adobe', 'photoshop',
-                      'illustrator', 'sketch', 'postman', 'swagger', 'vscode', 'intellij', 'eclipse', 'vim', 'emacs'],
-            'methodologies': ['agile', 'scrum', 'kanban', 'waterfall', 'devops', 'ci/cd', 'tdd', 'bdd', 'lean',
-                              'six sigma'],
-            'languages': ['english', 'spanish', 'french', 'german', 'chinese', 'japanese', 'korean', 'hindi', 'arabic',
-                          'portuguese', 'italian', 'russian']
-        }
-
-        self.experience_patterns = [
-            r'(\d+)\s*\+?\s*(?:years?|yrs?)\s*(?:of\s*)?experience',
-            r'experience:\s*(\d+)\s*(?:years?|yrs?)',
-            r'(\d+)\s*(?:years?|yrs?)\s*in\s*the\s*field',
-            r'(\d+)\s*(?:years?|yrs?)\s*professional\s*experience',
-            r'minimum\s+(\d+)\s*(?:years?|yrs?)',
-            r'at\s+least\s+(\d+)\s*(?:years?|yrs?)'
-        ]
-
-        self.education_patterns = {
-            'degrees': r'\b(bachelor|master|phd|doctorate|b\.?s\.?|m\.?s\.?|mba|b\.?a\.?|m\.?a\.?)\b',
-            'institutions': [
-                r'(?:from|at)\s+([A-Z][A-Za-z\s&.,]+(?:University|College|Institute|School))',
-                r'([A-Z][A-Za-z\s&.,]+(?:University|College|Institute|School))',
-            ],
-            'fields_of_study': [
-                r'(?:in|of)\s+(computer science|cs|information technology|it|software engineering|data science|ai|machine learning|mathematics|physics|chemistry|biology|business|economics)',
-                r'(computer science|cs|information technology|it|software engineering|data science|ai|machine learning)',
-                r'(?:in|of)\s+([A-Z][A-Za-z\s]+(?:Engineering|Science|Technology|Management|Arts))'
-            ]
-        }
-
-        self.company_patterns = [
-            r'(?:at|with|for)\s+([A-Z][A-Za-z\s&.,]+(?:Inc|Corp|LLC|Ltd|Company|Co|Inc|Corp|LLC|Ltd|Company|Co|))',
-            r'(?:worked\s+at|employed\s+at)\s+([A-Z][A-Za-z\s&.,]+)',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'
-        ]
-        self.title_patterns = [
-            r'(?:as\s+)?([A-Z][A-Za-z\s]+(?:Engineer|Developer|Manager|Analyst|Consultant|Specialist|Lead|Architect))',
-            r'(?:position|role|title):\s*([A-Z][A-Za-z\s]+)',
-            r'([A-Z][A-Za-z\s]+\s+Engineer|Developer|Manager|Analyst)'
-        ]
-
-        self.email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-
-        self.phone_patterns = [
-            r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',
-            r'\b\(\d{3}\)\s*\d{3}[-.]?\d{4}\b',
-            r'\b\+\d{1,3}[-.]?\d{3}[-.]?\d{3}[-.]?\d{4}\b'
-        ]
-        self.location_patterns = [
-            r'(?:from|in|based\s+in)\s+([A-Z][A-Za-z\s,]+(?:City|State|Country|CA|NY|TX|FL|IL|PA|OH|GA|NC|MI|NJ|VA|WA|AZ|MA|TN|IN|MO|MD|CO|MN|WI|LA|AL|SC|KY|OR|OK|CT|IA|MS|AR|KS|UT|NV|NM|NE|ID|WV|NH|ME|MT|RI|DE|SD|ND|AK|VT|WY))',
-            r'([A-Z][A-Za-z\s,]+(?:city|state|country|CA|NY))',
-            r'([A-Z][A-Za-z\s]+,\s*[A-Z]{2})',
-            r'([A-Za-z\s]+,\s*[A-Za-z]+)'
-        ]
-
-        # New patterns for date ranges
-        self.date_patterns = [
-            r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\s*–\s*(?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}|Present)',
-            r'\d{4}\s*–\s*\d{4}',
-            r'\d{4}\s*–\s*Present'
-        ]
-
-    def parse_resume(self, file_path: str) -> Dict:
-        text = self.extract_text(file_path)
-        skills = self.extract_skills(text)
-        experience = self.extract_experience(text)
-        education = self.extract_education(text)
-        contact = self.extract_contact_info(text)
+    # Caps how many matches any one pattern may collect, so pathological inputs can't grow the results without bound.
+    max_matches = 50
+
+    # Patterns are compiled once per process. Those that used to run one after another over the same text are
+    # combined into one alternation (one capture group per original pattern), so each field costs a single scan.
+    # Open-ended runs are bounded to 100 characters to keep backtracking linear on long unbroken text.
+
+    # Experience patterns stay separate and are tried in priority order: in one alternation a lower-priority match
+    # would consume text an earlier pattern needs, e.g. "minimum 2 years" hiding "2 years of experience".
+    experience_patterns = [re.compile(pattern) for pattern in (
+        r'(\d+)\s*\+?\s*(?:years?|yrs?)\s*(?:of\s*)?experience',
+        r'experience:\s*(\d+)\s*(?:years?|yrs?)',
+        r'(\d+)\s*(?:years?|yrs?)\s*in\s*the\s*field',
+        r'(\d+)\s*(?:years?|yrs?)\s*professional\s*experience',
+        r'minimum\s+(\d+)\s*(?:years?|yrs?)',
+        r'at\s+least\s+(\d+)\s*(?:years?|yrs?)'
+    )]
+
+    date_range_pattern = re.compile(
+        r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\s*–\s*(?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}|Present)'
+    )
+
+    # The former catch-all company pattern, r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', matched nearly every capitalized
+    # word, so it is no longer used.
+    company_pattern = re.compile('|'.join([
+        r'(?:worked\s+at|employed\s+at)\s+([A-Z][A-Za-z\s&.,]{0,100})',
+        r'(?:at|with|for)\s+([A-Z][A-Za-z\s&.,]{0,100}(?:Inc|Corp|LLC|Ltd|Company|Co|))'
+    ]))
+
+    title_pattern = re.compile('|'.join([
+        r'(?:as\s+)?([A-Z][A-Za-z\s]{1,100}(?:Engineer|Developer|Manager|Analyst|Consultant|Specialist|Lead|Architect))',
+        r'(?:position|role|title):\s*([A-Z][A-Za-z\s]{1,100})',
+        r'([A-Z][A-Za-z\s]{1,100}\s+Engineer|Developer|Manager|Analyst)'
+    ]))
+
+    degree_pattern = re.compile(r'\b(bachelor|master|phd|doctorate|b\.?s\.?|m\.?s\.?|mba|b\.?a\.?|m\.?a\.?)\b')
+
+    institution_pattern = re.compile('|'.join([
+        r'(?:from|at)\s+([A-Z][A-Za-z\s&.,]{1,100}(?:University|College|Institute|School))',
+        r'([A-Z][A-Za-z\s&.,]{1,100}(?:University|College|Institute|School))'
+    ]))
+
+    field_of_study_pattern = re.compile('|'.join([
+        r'(?:in|of)\s+(computer science|cs|information technology|it|software engineering|data science|ai|machine learning|mathematics|physics|chemistry|biology|business|economics)',
+        r'(computer science|cs|information technology|it|software engineering|data science|ai|machine learning)',
+        r'(?:in|of)\s+([A-Z][A-Za-z\s]{1,100}(?:Engineering|Science|Technology|Management|Arts))'
+    ]))
+
+    email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+    # Phone and location patterns are tried in priority order and stop at the first hit.
+    phone_patterns = [re.compile(pattern) for pattern in (
+        r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b',
+        r'\b\(\d{3}\)\s*\d{3}[-.]?\d{4}\b',
+        r'\b\+\d{1,3}[-.]?\d{3}[-.]?\d{3}[-.]?\d{4}\b'
+    )]
+
+    location_patterns = [re.compile(pattern) for pattern in (
+        r'(?:from|in|based\s+in)\s+([A-Z][A-Za-z\s,]{1,100}(?:City|State|Country|CA|NY|TX|FL|IL|PA|OH|GA|NC|MI|NJ|VA|WA|AZ|MA|TN|IN|MO|MD|CO|MN|WI|LA|AL|SC|KY|OR|OK|CT|IA|MS|AR|KS|UT|NV|NM|NE|ID|WV|NH|ME|MT|RI|DE|SD|ND|AK|VT|WY))',
+        r'([A-Z][A-Za-z\s,]{1,100}(?:city|state|country|CA|NY))',
+        r'([A-Z][A-Za-z\s]{1,100},\s*[A-Z]{2})',
+        r'([A-Za-z\s]{1,100},\s*[A-Za-z]+)'
+    )]
+
+    def _timed(self, timings: Dict[str, float], name: str, extractor: Callable, *args):
+        started = time.perf_counter()
+        result = extractor(*args)
+        timings[name] = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+    def parse_resume(self, source: Union[str, bytes]) -> Dict:
+        # Records each extractor's wall time in milliseconds, to show which one dominates.
+        timings = {}
+        text = self._timed(timings, 'text', self.extract_text, source)
+        skills = self._timed(timings, 'skills', self.extract_skills, text)
+        experience = self._timed(timings, 'experience', self.extract_experience, text)
+        education = self._timed(timings, 'education', self.extract_education, text)
+        contact = self._timed(timings, 'contact', self.extract_contact_info, text)
 
         return {
             'raw_text': text,
             'skills': skills,
             'experience': experience,
             'education': education,
-            'contact': contact
+            'contact': contact,
+            'timings': timings
         }
 
-    def extract_text(self, file_path: str) -> str:
-        text = ""
-
+    def extract_text(self, source: Union[str, bytes]) -> str:
         try:
-            with fitz.open(file_path) as doc:
-                for page in doc:
-                    text += page.get_text()
+            # Opens PDFs held in memory directly, so uploads never have to touch the disk.
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                doc = fitz.open(stream=source, filetype="pdf")
+            else:
+                doc = fitz.open(source)
+
+            with doc:
+                pages = [page.get_text() for page in doc]
         except Exception as e:
-            print(f"Error extracting text from {file_path}: {e}")
+            print(f"Error extracting text from {'uploaded stream' if not isinstance(source, str) else source}: {e}")
             return ""
 
-        return text.strip()
+        return "".join(pages).strip()
 
     def extract_skills(self, text: str) -> Dict[str, List[str]]:
-        found_skills = {}
-        text_lower = text.lower()
-
-        for category, skill_list in self.technical_skills.items():
-            found_skills[category] = []
-            for skill in skill_list:
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_skills[category].append(skill)
+        # Finds every taxonomy skill in one scan with the process-wide compiled matcher, reporting canonical names.
+        return get_skill_matcher(get_taxonomy()).extract(text)
 
-        return found_skills
+    def _find_all(self, pattern: re.Pattern, text: str) -> List[str]:
+        # Returns the captured text of each match (whichever alternative matched), up to max_matches.
+        return [match.group(match.lastindex or 0) for match in islice(pattern.finditer(text), self.max_matches)]
 
     def extract_experience(self, text: str) -> Dict:
         experience_info = {
@@ -126,22 +128,18 @@ class ResumeParser:
         }
 
         # First, try to find a numerical experience value
+        lowered = text.lower()
         for pattern in self.experience_patterns:
-            matches = re.findall(pattern, text.lower())
+            matches = pattern.findall(lowered)
             if matches:
-                try:
-                    experience_info['years_experience'] = max([int(match) for match in matches])
-                    # If found, we use this and do not proceed to date-based calculation
-                    return experience_info
-                except ValueError:
-                    continue
+                # The first pattern that matches decides, taking its highest value
+                experience_info['years_experience'] = max(int(match) for match in matches)
+                # If found, we use this and do not proceed to date-based calculation
+                return experience_info
 
         # If no numerical value is found, calculate experience from all found date ranges
         total_months = 0
-        date_ranges = re.findall(
-            r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}\s*–\s*(?:(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}|Present)',
-            text
-        )
+        date_ranges = [match.group(0) for match in islice(self.date_range_pattern.finditer(text), self.max_matches)]
 
         # This is a simple and flexible check for context
         for dr in date_ranges:
@@ -166,38 +164,19 @@ class ResumeParser:
             experience_info['years_experience'] = round(total_months / 12, 1)
 
         # Find companies and positions from the entire text
-        for pattern in self.company_patterns:
-            matches = re.findall(pattern, text)
-            experience_info['companies'].extend([match.strip() for match in matches])
-
-        for pattern in self.title_patterns:
-            matches = re.findall(pattern, text)
-            experience_info['positions'].extend([match.strip() for match in matches])
+        experience_info['companies'] = [match.strip() for match in self._find_all(self.company_pattern, text)]
+        experience_info['positions'] = [match.strip() for match in self._find_all(self.title_pattern, text)]
 
         return experience_info
 
     def extract_education(self, text: str) -> Dict:
-        education_info = {
-            'degrees': [],
-            'institutions': [],
-            'fields_of_study': []
-        }
-
-        # Find degrees using the improved patterns
-        degrees = re.findall(self.education_patterns['degrees'], text.lower())
-        education_info['degrees'] = list(set(degrees))
-
-        # Find institutions using the improved patterns
-        for pattern in self.education_patterns['institutions']:
-            matches = re.findall(pattern, text)
-            education_info['institutions'].extend([match.strip() for match in matches])
-
-        # Find fields of study using the improved patterns
-        for pattern in self.education_patterns['fields_of_study']:
-            matches = re.findall(pattern, text.lower())
-            education_info['fields_of_study'].extend(matches)
+        text_lower = text.lower()
 
-        return education_info
+        return {
+            'degrees': list(set(self._find_all(self.degree_pattern, text_lower))),
+            'institutions': [match.strip() for match in self._find_all(self.institution_pattern, text)],
+            'fields_of_study': self._find_all(self.field_of_study_pattern, text_lower)
+        }
 
     def extract_contact_info(self, text: str) -> Dict:
         contact_info = {
@@ -206,23 +185,22 @@ class ResumeParser:
             'location': ''
         }
 
-        email_matches = re.findall(self.email_pattern, text)
-
-        if email_matches:
-            contact_info['email'] = email_matches[0]
+        # Stops at the first hit instead of collecting every match only to keep the first one.
+        email_match = self.email_pattern.search(text)
+        if email_match:
+            contact_info['email'] = email_match.group(0)
 
         for pattern in self.phone_patterns:
-            phone_matches = re.findall(pattern, text)
-            if phone_matches:
-                contact_info['phone'] = phone_matches[0]
+            phone_match = pattern.search(text)
+            if phone_match:
+                contact_info['phone'] = phone_match.group(0)
                 break
 
         # Find location using the improved patterns
         for pattern in self.location_patterns:
-            matches = re.findall(pattern, text)
-
-            if matches:
-                contact_info['location'] = matches[0].strip()
+            location_match = pattern.search(text)
+            if location_match:
+                contact_info['location'] = location_match.group(1).strip()
                 break
 
         return contact_info
@@ -1,58 +1,89 @@
 import re
 import spacy
-from typing import Dict, List
+import config
+from itertools import islice
+from spacy.language import Language
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from spacy.matcher import PhraseMatcher
+from app.utils.skill_matrix import SkillMatrix
+from app.utils.skill_taxonomy import SkillTaxonomy, get_taxonomy
 
 class SimilarityScorer:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-
-        self.technical_skills = {
-            'programming': ['python', 'java', 'javascript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust', 'swift',
-                            'kotlin', 'scala', 'r', 'matlab', 'perl', 'bash', 'shell', 'powershell'],
-            'frameworks': ['django', 'flask', 'fastapi', 'react', 'angular', 'vue', 'spring', 'express', 'laravel',
-                           'asp.net', 'node.js', 'jquery', 'bootstrap', 'tailwind', 'material-ui', 'redux', 'vuex',
-                           'next.js', 'nuxt.js'],
-            'databases': ['mysql', 'postgresql', 'postgres', 'mongodb', 'redis', 'oracle', 'sqlite', 'sql server',
-                          'mariadb', 'cassandra', 'elasticsearch', 'dynamodb', 'firebase'],
-            'cloud': ['aws', 'amazon web services', 'azure', 'gcp', 'google cloud', 'docker', 'kubernetes', 'k8s',
-                      'terraform', 'ansible', 'jenkins', 'gitlab ci', 'github actions', 'heroku', 'digitalocean'],
-            'tools': ['git', 'github', 'gitlab', 'bitbucket', 'jira', 'confluence', 'figma', 'adobe', 'photoshop',
-                      'illustrator', 'sketch', 'postman', 'swagger', 'vscode', 'intellij', 'eclipse', 'vim', 'emacs'],
-            'methodologies': ['agile', 'scrum', 'kanban', 'waterfall', 'devops', 'ci/cd', 'tdd', 'bdd', 'lean',
-                              'six sigma'],
-            'languages': ['english', 'spanish', 'french', 'german', 'chinese', 'japanese', 'korean', 'hindi', 'arabic',
-                          'portuguese', 'italian', 'russian']
-        }
-
-    def _find_skills_with_spacy(self, text: str, skill_list: List[str]) -> List[str]:
-        # Creates a case-insensitive phrase matcher for finding skills from a predefined list.
+    experience_patterns = [re.compile(pattern) for pattern in (
+        r'experience\s+required:\s*(\d+)\s*\+?\s*years?',
+        r'(\d+)\s*\+?\s*(?:years?|yrs?)\s*(?:of\s*)?experience',
+        r'experience:\s*(\d+)\s*(?:years?|yrs?)',
+        r'(\d+)\s*(?:years?|yrs?)\s*in\s*the\s*field',
+        r'(\d+)\s*(?:years?|yrs?)\s*professional\s*experience',
+        r'minimum\s+(\d+)\s*(?:years?|yrs?)',
+        r'at\s+least\s+(\d+)\s*(?:years?|yrs?)'
+    )]
+
+    # Pipeline components each task reads from; everything else is disabled while that task runs.
+    phrase_pipes = ('tagger', 'morphologizer', 'attribute_ruler', 'parser')
+    contact_pipes = ('ner',)
+
+    def __init__(self, nlp: Optional[Language] = None):
+        # Reuses a preloaded pipeline when one is given, so the model is only loaded once per process.
+        self.nlp = nlp if nlp is not None else spacy.load(config.SPACY_MODEL)
+
+        # Holds (taxonomy version, matcher) together, so concurrent requests never pair a matcher with the wrong version.
+        self._skill_matcher: Optional[Tuple[str, PhraseMatcher]] = None
+
+    @property
+    def taxonomy(self) -> SkillTaxonomy:
+        # Reads the shared taxonomy on every use, so a reloaded file takes effect without restarting.
+        return get_taxonomy()
+
+    def _get_skill_matcher(self, taxonomy: SkillTaxonomy) -> PhraseMatcher:
+        # Rebuilds the phrase matcher only when the taxonomy version changes.
+        cached = self._skill_matcher
+        if cached is None or cached[0] != taxonomy.version:
+            cached = self._skill_matcher = (taxonomy.version, self._build_skill_matcher(taxonomy))
+
+        return cached[1]
+
+    def _build_skill_matcher(self, taxonomy: SkillTaxonomy) -> PhraseMatcher:
+        # Creates one case-insensitive phrase matcher covering every skill category, synonyms included.
         matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
 
-        # Processes a list of text skills into a format suitable for the PhraseMatcher.
-        patterns = []
-        for skill in skill_list:
-            patterns.append(self.nlp(skill))
+        for category, forms in taxonomy.category_forms.items():
+            # Tokenizes the patterns only; the matcher compares LOWER, so the rest of the pipeline isn't needed.
+            matcher.add(category, [self.nlp.make_doc(form) for form in forms])
 
-        # Adds the prepared skill patterns to the matcher under the label "SKILLS".
-        matcher.add("SKILLS", patterns)
+        return matcher
 
-        # Processes the raw text into a spaCy Doc object for linguistic analysis.
-        doc = self.nlp(text)
+    def _find_skills_with_spacy(self, text: str) -> Dict[str, List[str]]:
+        taxonomy = self.taxonomy
+        # Tokenizes the text once and runs every category's patterns over it in a single pass.
+        doc = self.nlp.make_doc(text)
 
-        # Runs the PhraseMatcher on the Doc object to find all skill matches.
-        matches = matcher(doc)
+        found_ids = set()
+        for match_id, start, end in self._get_skill_matcher(taxonomy)(doc):
+            # Resolves the matched text (possibly a synonym) to its canonical skill's id.
+            skill_id = taxonomy.skill_id(doc[start:end].text)
+            if skill_id is not None:
+                found_ids.add(skill_id)
 
-        found_skills = set()
-        for _, start, end in matches:
-            # Adds the matched skill text to the set, preventing duplicates.
-            found_skills.add(doc[start:end].text)
+        # Lists each category's canonical skills in taxonomy order.
+        return {category: [skill for skill in skill_list if taxonomy.ids[skill] in found_ids]
+                for category, skill_list in taxonomy.category_skills.items()}
 
-        return list(found_skills)
+    def _disabled_pipes(self, needed: Iterable[str]) -> List[str]:
+        needed = set(needed)
 
-    def extract_contact_info(self, text: str) -> Dict[str, str]:
-        # Processes the raw text into a spaCy Doc object for linguistic analysis.
-        doc = self.nlp(text)
+        # Keeps any shared embedding layer (tok2vec/transformer) that a needed component listens to.
+        for name, component in self.nlp.pipeline:
+            if set(getattr(component, 'listening_components', [])) & needed:
+                needed.add(name)
+
+        return [name for name in self.nlp.pipe_names if name not in needed]
+
+    def _pipe(self, texts: Iterable[str], needed: Iterable[str], batch_size: Optional[int] = None) -> Iterator:
+        # Streams the texts through a trimmed pipeline in batches instead of one full-pipeline call per document.
+        return self.nlp.pipe(texts, batch_size=batch_size or config.NLP_BATCH_SIZE, disable=self._disabled_pipes(needed))
+
+    def _contact_info_from_doc(self, text: str, doc) -> Dict[str, str]:
         contact_info = {
             'email': '',
             'phone': '',
@@ -79,12 +110,16 @@ class SimilarityScorer:
 
         return contact_info
 
-    def extract_skills_from_job_description(self, job_text: str) -> Dict[str, List[str]]:
-        found_skills = {}
-        for category, skill_list in self.technical_skills.items():
-            found_skills[category] = self._find_skills_with_spacy(job_text, skill_list)
+    def extract_contact_info_batch(self, texts: List[str], batch_size: Optional[int] = None) -> List[Dict[str, str]]:
+        # Runs only the NER component, since the location is the only field that needs spaCy.
+        docs = self._pipe(texts, self.contact_pipes, batch_size)
+        return [self._contact_info_from_doc(text, doc) for text, doc in zip(texts, docs)]
 
-        return found_skills
+    def extract_contact_info(self, text: str) -> Dict[str, str]:
+        return self.extract_contact_info_batch([text])[0]
+
+    def extract_skills_from_job_description(self, job_text: str) -> Dict[str, List[str]]:
+        return self._find_skills_with_spacy(job_text)
 
     def preprocess_text(self, text: str) -> str:
         text = text.lower()
@@ -92,17 +127,18 @@ class SimilarityScorer:
         text = re.sub(r'\s+', ' ', text).strip()
         return text
 
-    def calculate_text_score(self, job_text: str, resume_text: str) -> float:
-        job_text_processed = self.preprocess_text(job_text)
-        resume_text_processed = self.preprocess_text(resume_text)
+    def extract_noun_phrases_batch(self, texts: List[str], batch_size: Optional[int] = None) -> List[List[str]]:
+        # Processes the normalized texts with only the components noun_chunks depends on (tags and dependencies).
+        docs = self._pipe((self.preprocess_text(text) for text in texts), self.phrase_pipes, batch_size)
+
+        # Extracts all unique noun phrases (key topics) from each text.
+        return [list(set(chunk.text for chunk in doc.noun_chunks)) for doc in docs]
 
-        # Processes the raw text into a spaCy Doc object for linguistic analysis.
-        job_doc = self.nlp(job_text_processed)
-        resume_doc = self.nlp(resume_text_processed)
+    def extract_noun_phrases(self, text: str) -> List[str]:
+        return self.extract_noun_phrases_batch([text])[0]
 
-        # Extracts all unique noun phrases (key topics) from the text.
-        job_phrases = set(chunk.text for chunk in job_doc.noun_chunks)
-        resume_phrases = set(chunk.text for chunk in resume_doc.noun_chunks)
+    def calculate_phrase_score(self, job_phrases: List[str], resume_phrases: List[str]) -> float:
+        job_phrases = set(job_phrases)
 
         # Returns a score of 0.0 if the job_phreases has no phrases to match, preventing a division-by-zero error.
         if not job_phrases:
@@ -119,24 +155,20 @@ class SimilarityScorer:
         if not job_skills or not resume_skills:
             return 0.0
 
+        taxonomy = self.taxonomy
         total_score = 0.0
         total_weight = 0.0
 
-        category_weights = {
-            'programming': 0.25, 'frameworks': 0.20, 'databases': 0.15,
-            'cloud': 0.15, 'tools': 0.10, 'methodologies': 0.10, 'languages': 0.05
-        }
-
         for category, job_skill_list in job_skills.items():
             if category in resume_skills and job_skill_list:
                 # Gets the candidate's skills list for the current category.
                 resume_skill_list = resume_skills[category]
 
-                # Standardizes job skills into a clean, lowercase set for efficient comparison.
-                job_skill_set = set(s.lower().strip() for s in job_skill_list)
+                # Resolves job skills, synonyms included, to a set of canonical skill ids.
+                job_skill_set = taxonomy.skill_keys(job_skill_list)
 
-                # Standardizes resume skills into a clean, lowercase set for comparison.
-                resume_skill_set = set(s.lower().strip() for s in resume_skill_list)
+                # Resolves resume skills to canonical skill ids, so the intersection compares integers.
+                resume_skill_set = taxonomy.skill_keys(resume_skill_list)
 
                 # Counts the number of exactly matching skills between the job and the resume.
                 matches = len(job_skill_set & resume_skill_set)
@@ -148,7 +180,7 @@ class SimilarityScorer:
                 category_score = matches / total_required if total_required > 0 else 0.0
 
                 # Retrieves the importance weight for the current skill category.
-                weight = category_weights.get(category, 0.05)
+                weight = taxonomy.category_weights.get(category, taxonomy.default_weight)
 
                 # Adds the weighted category score to the running total.
                 total_score += category_score * weight
@@ -160,23 +192,13 @@ class SimilarityScorer:
 
         return round(final_score, 2)
 
-    def calculate_experience_match_score(self, job_text: str, resume_experience: Dict) -> float:
-        experience_patterns = [
-            r'experience\s+required:\s*(\d+)\s*\+?\s*years?',
-            r'(\d+)\s*\+?\s*(?:years?|yrs?)\s*(?:of\s*)?experience',
-            r'experience:\s*(\d+)\s*(?:years?|yrs?)',
-            r'(\d+)\s*(?:years?|yrs?)\s*in\s*the\s*field',
-            r'(\d+)\s*(?:years?|yrs?)\s*professional\s*experience',
-            r'minimum\s+(\d+)\s*(?:years?|yrs?)',
-            r'at\s+least\s+(\d+)\s*(?:years?|yrs?)'
-        ]
-
+    def extract_required_years(self, job_text: str) -> int:
         required_years = 0
         job_text_lower = job_text.lower()
 
         # Loops through patterns to find the highest number of years required.
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, job_text_lower)
+        for pattern in self.experience_patterns:
+            matches = pattern.findall(job_text_lower)
             # If a match is found, sets the required years and exits the loop.
             if matches:
                 try:
@@ -185,6 +207,31 @@ class SimilarityScorer:
                 except ValueError:
                     continue
 
+        return required_years
+
+    def build_skill_matrix(self, job_skills: Dict[str, List[str]]) -> SkillMatrix:
+        taxonomy = self.taxonomy
+        # Indexes the taxonomy plus anything the job asks for, so every job skill has a column to match against.
+        vocabulary = {category: list(skill_list) for category, skill_list in taxonomy.category_skills.items()}
+        for category, job_skill_list in (job_skills or {}).items():
+            vocabulary.setdefault(category, []).extend(job_skill_list)
+
+        # Columns are canonical skills, so a synonym on either side lands in the same column.
+        return SkillMatrix(vocabulary, taxonomy.category_weights, taxonomy.default_weight, normalize=taxonomy.canonical, taxonomy=taxonomy)
+
+    def calculate_skill_match_scores(self, job_skills: Dict[str, List[str]], resume_skills_list: List[Dict[str, List[str]]],
+                                     skill_bits_list: Optional[List[Optional[str]]] = None) -> List[float]:
+        # Scores a whole pool at once; the results equal calculate_skill_match_score for each resume.
+        skill_matrix = self.build_skill_matrix(job_skills)
+        return skill_matrix.score(skill_matrix.encode(resume_skills_list, skill_bits_list), job_skills)
+
+    def get_missing_skills_batch(self, job_skills: Dict[str, List[str]], resume_skills_list: List[Dict[str, List[str]]],
+                                 skill_bits_list: Optional[List[Optional[str]]] = None) -> List[Dict[str, List[str]]]:
+        # Lists missing skills for a whole pool at once from the same matrix as the batch scores.
+        skill_matrix = self.build_skill_matrix(job_skills)
+        return skill_matrix.missing(skill_matrix.encode(resume_skills_list, skill_bits_list), job_skills)
+
+    def calculate_experience_score(self, required_years: int, resume_experience: Dict) -> float:
         # Returns 100% if no years were specified or if the resume lacks experience data.
         if required_years == 0 or 'years_experience' not in resume_experience:
             return 100.0
@@ -204,44 +251,119 @@ class SimilarityScorer:
             # Heavily penalizes underqualified candidates.
             return max(0.0, 100.0 - (required_years - candidate_years) * 20)
 
-    def rank_resumes_enhanced(self, job_description: Dict, resumes: List[Dict]) -> List[Dict]:
-        if not resumes:
-            return []
-
-        # Extracts and categorizes all required skills from the job description.
-        job_skills = self.extract_skills_from_job_description(job_description.get('text', ''))
+    def build_job_features(self, job_text: str) -> Dict:
+        # Computes everything ranking needs from the job text, so it can be stored once at upload time.
+        # The version is read first, so a reload during extraction leaves it stale and the skills get re-extracted.
+        return {
+            'skills_taxonomy_version': self.taxonomy.version,
+            'skills': self.extract_skills_from_job_description(job_text),
+            'noun_phrases': self.extract_noun_phrases(job_text),
+            'required_years': self.extract_required_years(job_text)
+        }
 
-        # Gets the raw text of the job description for use in other scoring functions.
+    def get_job_features(self, job_description: Dict) -> Dict:
+        # Uses the features stored with the job, computing only the ones missing (e.g. jobs stored before they existed).
         job_text = job_description.get('text', '')
+        skills = job_description.get('skills')
+        noun_phrases = job_description.get('noun_phrases')
+        required_years = job_description.get('required_years')
+
+        return {
+            'skills': skills if skills is not None else self.extract_skills_from_job_description(job_text),
+            'noun_phrases': noun_phrases if noun_phrases is not None else self.extract_noun_phrases(job_text),
+            'required_years': required_years if required_years is not None else self.extract_required_years(job_text)
+        }
+
+    def build_resume_features_batch(self, resume_texts: List[str], batch_size: Optional[int] = None) -> List[Dict]:
+        # Computes the resumes' spaCy-derived features in two batched streams, so they can be stored once at upload time.
+        noun_phrases = self.extract_noun_phrases_batch(resume_texts, batch_size)
+        contact_info = self.extract_contact_info_batch(resume_texts, batch_size)
+
+        return [{'noun_phrases': phrases, 'contact_info': contact} for phrases, contact in zip(noun_phrases, contact_info)]
+
+    def fill_resume_features(self, resumes: List[Dict], batch_size: Optional[int] = None,
+                             fields: Iterable[str] = ('noun_phrases', 'contact_info')) -> List[Dict]:
+        # Batches the spaCy work for resumes stored without features, instead of processing them one by one.
+        missing_phrases = [r for r in resumes if r.get('noun_phrases') is None] if 'noun_phrases' in fields else []
+        missing_contact = [r for r in resumes if r.get('contact_info') is None] if 'contact_info' in fields else []
+
+        if missing_phrases:
+            texts = [r.get('text', '') for r in missing_phrases]
+            for resume, phrases in zip(missing_phrases, self.extract_noun_phrases_batch(texts, batch_size)):
+                resume['noun_phrases'] = phrases
+
+        if missing_contact:
+            texts = [r.get('text', '') for r in missing_contact]
+            for resume, contact in zip(missing_contact, self.extract_contact_info_batch(texts, batch_size)):
+                resume['contact_info'] = contact
+
+        return resumes
+
+    def get_resume_features(self, resume: Dict) -> Dict:
+        # Uses the features stored with the resume, computing only the ones missing (e.g. resumes stored before they existed).
+        resume_text = resume.get('text', '')
+        noun_phrases = resume.get('noun_phrases')
+        contact_info = resume.get('contact_info')
+
+        return {
+            'noun_phrases': noun_phrases if noun_phrases is not None else self.extract_noun_phrases(resume_text),
+            'contact_info': contact_info if contact_info is not None else self.extract_contact_info(resume_text)
+        }
+
+    def score_resumes(self, job_description: Dict, resumes: Iterable[Dict], batch_size: Optional[int] = None,
+                      chunk_size: Optional[int] = None) -> List[Dict]:
+        # Reads the job's categorized skills, noun phrases and required years once for the whole pool.
+        job_features = self.get_job_features(job_description)
+        job_skills = job_features['skills']
+        skill_matrix = self.build_skill_matrix(job_skills)
 
         results = []
+        resumes = iter(resumes)
+        chunk_size = max(1, chunk_size or config.DB_STREAM_BATCH)
+
+        # Consumes the resumes a chunk at a time, so a streamed pool is never held in memory as a whole.
+        while chunk := list(islice(resumes, chunk_size)):
+            # Computes any noun phrases missing from storage in one batched stream before scoring.
+            self.fill_resume_features(chunk, batch_size, fields=('noun_phrases',))
 
-        for resume in resumes:
-            # Calculates a weighted skill match score by comparing the job skills to the candidate's skills.
-            skill_score = self.calculate_skill_match_score(job_skills, resume.get('skills', {}))
+            # Calculates weighted skill match scores for the chunk with a few matrix operations, from the stored skill bits where current.
+            encoded = skill_matrix.encode([resume.get('skills', {}) for resume in chunk], [resume.get('skill_bits') for resume in chunk])
+            skill_scores = skill_matrix.score(encoded, job_skills)
 
-            # Calculates a score based on how well the candidate's years of experience align with the job's requirements.
-            experience_score = self.calculate_experience_match_score(job_text, resume.get('experience', {}))
+            for resume, skill_score in zip(chunk, skill_scores):
+                # Calculates a score based on how well the candidate's years of experience align with the job's requirements.
+                experience_score = self.calculate_experience_score(job_features['required_years'], resume.get('experience', {}))
 
-            # Calculates a text similarity score by comparing the job and resume text using noun phrases.
-            text_score = self.calculate_text_score(job_text, resume.get('text', ''))
+                # Calculates a text similarity score by comparing the job and resume noun phrases.
+                text_score = self.calculate_phrase_score(job_features['noun_phrases'], resume['noun_phrases'])
 
-            combined_score = (skill_score * 0.5 + experience_score * 0.3 + text_score * 0.2)
+                combined_score = (skill_score * 0.5 + experience_score * 0.3 + text_score * 0.2)
 
-            skills_summary = self.get_skills_summary(resume.get('skills', {}))
-            contact_info = self.extract_contact_info(resume.get('text', ''))
+                results.append({
+                    'uuid': resume['uuid'], 'filename': resume['filename'], 'skill_score': skill_score,
+                    'text_score': text_score, 'experience_score': round(experience_score, 2),
+                    'combined_score': round(combined_score, 2),
+                    'experience_years': resume.get('experience', {}).get('years_experience', 0)
+                })
 
-            results.append({
-                'uuid': resume['uuid'], 'filename': resume['filename'], 'skill_score': skill_score,
-                'text_score': text_score, 'experience_score': round(experience_score, 2),
-                'combined_score': round(combined_score, 2), 'skills_found': skills_summary,
-                'experience_years': resume.get('experience', {}).get('years_experience', 0),
-                'contact_info': contact_info
-            })
+        return results
 
-        # Sorts the list of candidate results by their combined_score in descending order, ranking the resumes from highest to lowest.
+    def select_top(self, results: List[Dict]) -> List[Dict]:
+        # Sorts the candidates by combined_score in descending order, ranking the resumes from highest to lowest.
         return sorted(results, key=lambda x: x['combined_score'], reverse=True)
 
+    def decorate_results(self, results: List[Dict], resumes: List[Dict], batch_size: Optional[int] = None) -> List[Dict]:
+        # Adds the skills summary and contact details, only for the rows that are actually returned.
+        resumes_by_uuid = {resume['uuid']: resume for resume in resumes}
+        selected = [resumes_by_uuid[result['uuid']] for result in results]
+        self.fill_resume_features(selected, batch_size, fields=('contact_info',))
+
+        for result, resume in zip(results, selected):
+            result['skills_found'] = self.get_skills_summary(resume.get('skills', {}))
+            result['contact_info'] = resume['contact_info']
+
+        return results
+
     def get_skills_summary(self, skills: Dict[str, List[str]]) -> str:
         if not skills:
             return "No specific skills detected"
@@ -251,15 +373,15 @@ class SimilarityScorer:
         return ', '.join(all_skills) if all_skills else "No specific skills detected"
 
     def get_detailed_analysis(self, job_description: Dict, resume: Dict) -> Dict:
-        job_text = job_description.get('text', '')
-        job_skills = self.extract_skills_from_job_description(job_text)
+        job_features = self.get_job_features(job_description)
+        job_skills = job_features['skills']
 
-        resume_text = resume.get('text', '')
-        contact_info = self.extract_contact_info(resume_text)
+        resume_features = self.get_resume_features(resume)
+        contact_info = resume_features['contact_info']
 
         skill_score = self.calculate_skill_match_score(job_skills, resume.get('skills', {}))
-        experience_score = self.calculate_experience_match_score(job_text, resume.get('experience', {}))
-        text_score = self.calculate_text_score(job_text, resume_text)
+        experience_score = self.calculate_experience_score(job_features['required_years'], resume.get('experience', {}))
+        text_score = self.calculate_phrase_score(job_features['noun_phrases'], resume_features['noun_phrases'])
 
         combined_score = (skill_score * 0.5 + experience_score * 0.3 + text_score * 0.2)
         missing_skills_dict = self.get_missing_skills(job_skills, resume.get('skills', {}))
@@ -281,11 +403,13 @@ class SimilarityScorer:
         }
 
     def get_missing_skills(self, job_skills: Dict[str, List[str]], resume_skills: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        taxonomy = self.taxonomy
         missing_skills = {}
 
         for category, job_skill_list in job_skills.items():
-            job_skill_set = set(s.lower().strip() for s in job_skill_list)
-            resume_skill_set = set(s.lower().strip() for s in resume_skills.get(category, []))
+            # Compares canonical names, so a synonym in the resume covers the job's skill.
+            job_skill_set = set(taxonomy.canonical(s) for s in job_skill_list)
+            resume_skill_set = set(taxonomy.canonical(s) for s in resume_skills.get(category, []))
 
             missing = list(job_skill_set - resume_skill_set)
 
@@ -0,0 +1,78 @@
+import re
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from app.utils.skill_taxonomy import SkillTaxonomy
+
+class SkillPatternMatcher:
+    def __init__(self, taxonomy: SkillTaxonomy):
+        self.taxonomy = taxonomy
+        # Matches every surface form, synonyms included; extract() reports the canonical skill each one stands for.
+        skills = sorted(set(form for forms in taxonomy.category_forms.values() for form in forms))
+
+        # Compiles every skill into one trie-shaped alternation, so the text is scanned once instead of once per skill.
+        # The scan runs inside a lookahead so every word boundary is tried, including ones inside an earlier match.
+        # A skill never starts right after a dot inside a word: spaCy keeps 'node.js' as one token, so the job-side
+        # PhraseMatcher doesn't see 'js' in it, and neither may the parser.
+        self.pattern = re.compile(r'\b(?<!\w\.)(?=(' + self._trie_pattern(skills) + r')\b)')
+
+        # The trie returns the longest skill at a position; shorter skills that are prefixes of it are checked directly.
+        self.prefix_patterns: Dict[str, List[Tuple[str, re.Pattern]]] = {
+            skill: [(prefix, re.compile(re.escape(prefix) + r'\b')) for prefix in skills
+                    if prefix != skill and skill.startswith(prefix)]
+            for skill in skills
+        }
+
+    @staticmethod
+    def _trie_pattern(skills: List[str]) -> str:
+        trie: Dict = {}
+        for skill in skills:
+            node = trie
+            for char in skill:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def build(node: Dict) -> str:
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            # A skill ends here, so the longer continuations are optional; greedy matching still tries them first.
+            return '(?:' + body + ')?' if '' in node else body
+
+        return build(trie)
+
+    def find(self, text_lower: str) -> Set[str]:
+        found = set()
+
+        for match in self.pattern.finditer(text_lower):
+            skill = match.group(1)
+            found.add(skill)
+            for prefix, prefix_pattern in self.prefix_patterns[skill]:
+                if prefix not in found and prefix_pattern.match(text_lower, match.start()):
+                    found.add(prefix)
+
+        return found
+
+    def extract(self, text: str) -> Dict[str, List[str]]:
+        ids = self.taxonomy.ids
+        found = set(ids[form] for form in self.find(text.lower()))
+        # Lists each category's canonical skills in taxonomy order.
+        return {category: [skill for skill in skill_list if ids[skill] in found]
+                for category, skill_list in self.taxonomy.category_skills.items()}
+
+_lock = threading.Lock()
+_matcher: Optional[SkillPatternMatcher] = None
+
+def get_skill_matcher(taxonomy: SkillTaxonomy) -> SkillPatternMatcher:
+    global _matcher
+
+    # Builds the matcher once per taxonomy version, replacing it when the taxonomy is reloaded.
+    matcher = _matcher
+    if matcher is None or matcher.taxonomy.version != taxonomy.version:
+        with _lock:
+            matcher = _matcher
+            if matcher is None or matcher.taxonomy.version != taxonomy.version:
+                matcher = _matcher = SkillPatternMatcher(taxonomy)
+
+    return matcher
@@ -0,0 +1,179 @@
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+from app.utils.skill_taxonomy import SkillTaxonomy
+
+def _normalize(skill: str) -> str:
+    return skill.lower().strip()
+
+def _round2(values: np.ndarray) -> List[float]:
+    # Matches Python's round(x, 2), so the results are identical to calculate_skill_match_score. np.round scales by
+    # 100 first, which only lands on the other side of a tie when x * 100 is within rounding error of one; those few
+    # are rounded again in Python.
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    for i in np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6).tolist():
+        rounded[i] = round(float(values[i]), 2)
+    return rounded.tolist()
+
+def _assign(target: np.ndarray, rows: np.ndarray, columns, values: np.ndarray) -> None:
+    if isinstance(columns, slice):
+        target[rows, columns] = values
+    else:
+        target[np.ix_(rows, columns)] = values
+
+class SkillMatrix:
+    def __init__(self, vocabulary: Dict[str, List[str]], category_weights: Dict[str, float], default_weight: float = 0.05,
+                 normalize: Optional[Callable[[str], str]] = None, taxonomy: Optional[SkillTaxonomy] = None):
+        self.category_weights = category_weights
+        self.default_weight = default_weight
+        # Maps a stored skill name to its vocabulary form, e.g. a synonym to its canonical skill.
+        self.normalize = normalize or _normalize
+
+        # Assigns every category and every (category, skill) pair a fixed column in the matrix.
+        self.category_index: Dict[str, int] = {}
+        self.skill_columns: Dict[str, Dict[str, int]] = {}
+        self.skill_names: List[str] = []
+        for category, skill_list in vocabulary.items():
+            self.category_index.setdefault(category, len(self.category_index))
+            columns = self.skill_columns.setdefault(category, {})
+            for skill in skill_list:
+                skill = self.normalize(skill)
+                if skill not in columns:
+                    columns[skill] = len(self.skill_names)
+                    self.skill_names.append(skill)
+
+        # Maps taxonomy skill ids and category positions to columns, for resumes whose skills were stored as bits.
+        self.taxonomy = None
+        if taxonomy is not None and all(category in self.category_index for category in taxonomy.categories):
+            self.taxonomy = taxonomy
+            self.version_bytes = np.frombuffer(bytes.fromhex(taxonomy.version), dtype=np.uint8)
+            self.id_columns = np.array([self.skill_columns[taxonomy.categories[position]][name]
+                                        for name, position in zip(taxonomy.names, taxonomy.skill_categories)], dtype=np.int64)
+            self.position_columns = np.array([self.category_index[category] for category in taxonomy.categories], dtype=np.int64)
+            self.id_count = len(self.id_columns)
+            self.position_count = len(self.position_columns)
+            self.category_bytes = (self.position_count + 7) // 8
+            self.bits_length = 2 * (len(self.version_bytes) + self.category_bytes + (self.id_count + 7) // 8)
+
+            # The taxonomy comes first in the vocabulary, so its columns are normally a prefix that a slice can address.
+            if np.array_equal(self.id_columns, np.arange(self.id_count)):
+                self.id_columns = slice(0, self.id_count)
+            if np.array_equal(self.position_columns, np.arange(self.position_count)):
+                self.position_columns = slice(0, self.position_count)
+
+    def encode(self, resume_skills_list: List[Dict[str, List[str]]],
+               skill_bits_list: Optional[List[Optional[str]]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        resume_count = len(resume_skills_list)
+
+        # Encodes each resume as one boolean row over the skill vocabulary.
+        skills = np.zeros((resume_count, len(self.skill_names)), dtype=bool)
+        # Tracks which categories each resume has at all, since only those count towards its total weight.
+        categories = np.zeros((resume_count, len(self.category_index)), dtype=bool)
+        has_skills = np.zeros(resume_count, dtype=bool)
+        named_rows = np.ones(resume_count, dtype=bool)
+
+        if skill_bits_list and self.taxonomy is not None and resume_count:
+            # Decodes the whole chunk at once; rows stored by another taxonomy version fail the version check below.
+            filler = '0' * self.bits_length
+            packed = [bits if bits is not None and len(bits) == self.bits_length else filler for bits in skill_bits_list]
+            raw = np.frombuffer(bytes.fromhex(''.join(packed)), dtype=np.uint8).reshape(resume_count, -1)
+            current = (raw[:, :len(self.version_bytes)] == self.version_bytes).all(axis=1)
+
+            # The category bits come first, padded to a whole byte, then one bit per taxonomy skill.
+            flags = np.unpackbits(raw[current, len(self.version_bytes):], axis=1, bitorder='little').view(bool)
+            category_flags = flags[:, :self.position_count]
+            skill_offset = self.category_bytes * 8
+
+            rows = np.flatnonzero(current)
+            _assign(categories, rows, self.position_columns, category_flags)
+            _assign(skills, rows, self.id_columns, flags[:, skill_offset:skill_offset + self.id_count])
+            has_skills[rows] = category_flags.any(axis=1)
+            named_rows = ~current
+
+        rows, columns, category_rows, category_columns = [], [], [], []
+        for row in np.flatnonzero(named_rows).tolist():
+            resume_skills = resume_skills_list[row]
+            # Resumes with no skill data always score 0.
+            if not resume_skills:
+                continue
+
+            has_skills[row] = True
+            for category, skill_list in resume_skills.items():
+                skill_columns = self.skill_columns.get(category)
+                if skill_columns is None:
+                    continue
+
+                category_rows.append(row)
+                category_columns.append(self.category_index[category])
+                for skill in skill_list:
+                    # Tries the stored form first; skills from the parser are already canonical.
+                    column = skill_columns.get(skill)
+                    if column is None:
+                        column = skill_columns.get(self.normalize(skill))
+                    if column is not None:
+                        rows.append(row)
+                        columns.append(column)
+
+        skills[rows, columns] = True
+        categories[category_rows, category_columns] = True
+
+        return skills, categories, has_skills
+
+    def _job_columns(self, job_skills: Dict[str, List[str]]):
+        # Turns the job into a per-category mask: the vocabulary columns it requires and how many skills that is.
+        for category, job_skill_list in job_skills.items():
+            if not job_skill_list:
+                continue
+
+            job_skill_set = set(self.normalize(s) for s in job_skill_list)
+            skill_columns = self.skill_columns.get(category, {})
+            columns = sorted(skill_columns[s] for s in job_skill_set if s in skill_columns)
+            yield category, columns, len(job_skill_set)
+
+    def score(self, encoded: Tuple[np.ndarray, np.ndarray, np.ndarray], job_skills: Dict[str, List[str]]) -> List[float]:
+        skills, categories, has_skills = encoded
+        resume_count = skills.shape[0]
+
+        if not job_skills:
+            return [0.0] * resume_count
+
+        # Counts every resume's matches in every job category with one matrix product over the job's columns.
+        job_categories = list(self._job_columns(job_skills))
+        # Counts are small integers, so float32 holds them exactly; they are widened again before any division.
+        job_mask = np.zeros((len(self.skill_names), len(job_categories)), dtype=np.float32)
+        for position, (_, columns, _) in enumerate(job_categories):
+            job_mask[columns, position] = 1
+        matches = (skills.view(np.uint8).astype(np.float32) @ job_mask).astype(np.float64)
+
+        total_score = np.zeros(resume_count)
+        total_weight = np.zeros(resume_count)
+
+        # Accumulates categories in the job's order, so every resume sees exactly the float operations of the scalar path.
+        for position, (category, _, total_required) in enumerate(job_categories):
+            category_column = self.category_index.get(category)
+            if category_column is None:
+                continue
+
+            weight = self.category_weights.get(category, self.default_weight)
+            in_resume = categories[:, category_column]
+
+            total_score = np.where(in_resume, total_score + (matches[:, position] / total_required) * weight, total_score)
+            total_weight = np.where(in_resume, total_weight + weight, total_weight)
+
+        scored = has_skills & (total_weight > 0)
+        final_score = np.zeros(resume_count)
+        final_score[scored] = (total_score[scored] / total_weight[scored]) * 100
+
+        return _round2(final_score)
+
+    def missing(self, encoded: Tuple[np.ndarray, np.ndarray, np.ndarray], job_skills: Dict[str, List[str]]) -> List[Dict[str, List[str]]]:
+        skills = encoded[0]
+        missing_skills = [{} for _ in range(skills.shape[0])]
+
+        for category, columns, _ in self._job_columns(job_skills):
+            # Every job skill absent from a resume's row is missing for that resume.
+            missing_mask = ~skills[:, columns]
+            for row in np.flatnonzero(missing_mask.any(axis=1)).tolist():
+                missing_skills[row][category] = [self.skill_names[columns[i]] for i in np.flatnonzero(missing_mask[row]).tolist()]
+
+        return missing_skills
@@ -0,0 +1,123 @@
+import os
+import sys
+import json
+import time
+import config
+import hashlib
+import threading
+from typing import Dict, List, Optional, Set, Union
+
+def _bitset(positions: Set[int], size: int) -> bytearray:
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return bits
+
+class SkillTaxonomy:
+    def __init__(self, data: Dict, version: str):
+        # Identifies the taxonomy by its content, so every process that loads the same file agrees on the version.
+        self.version = version
+        self.category_weights: Dict[str, float] = data.get('category_weights', {})
+        self.default_weight: float = data.get('default_weight', 0.05)
+
+        # Gives every canonical skill an integer id; each synonym resolves to its canonical skill's id.
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.categories: List[str] = list(data['categories'])
+        self.category_positions: Dict[str, int] = {category: position for position, category in enumerate(self.categories)}
+        # Position in categories of each canonical skill's category.
+        self.skill_categories: List[int] = []
+        self.category_skills: Dict[str, List[str]] = {}
+        self.category_forms: Dict[str, List[str]] = {}
+
+        for position, (category, skills) in enumerate(data['categories'].items()):
+            category = sys.intern(category)
+            canonical_names = self.category_skills.setdefault(category, [])
+            forms = self.category_forms.setdefault(category, [])
+
+            for name, synonyms in skills.items():
+                name = sys.intern(name.lower().strip())
+                if name in self.ids:
+                    print(f"Warning: skill '{name}' is listed more than once in the taxonomy; keeping the first.")
+                    continue
+
+                skill_id = len(self.names)
+                self.names.append(name)
+                self.skill_categories.append(position)
+                canonical_names.append(name)
+
+                for form in [name, *synonyms]:
+                    form = sys.intern(form.lower().strip())
+                    if form in self.ids:
+                        continue
+                    self.ids[form] = skill_id
+                    forms.append(form)
+
+    def skill_id(self, skill: str) -> Optional[int]:
+        skill_id = self.ids.get(skill)
+        return skill_id if skill_id is not None else self.ids.get(skill.lower().strip())
+
+    def canonical(self, skill: str) -> str:
+        skill_id = self.skill_id(skill)
+        return self.names[skill_id] if skill_id is not None else skill.lower().strip()
+
+    def skill_keys(self, skills: List[str]) -> Set[Union[int, str]]:
+        # Known skills compare by id; anything outside the taxonomy (e.g. a since-removed skill) by its normalized name.
+        keys = set()
+        for skill in skills:
+            skill_id = self.skill_id(skill)
+            keys.add(skill_id if skill_id is not None else skill.lower().strip())
+        return keys
+
+    def encode(self, skills: Dict[str, List[str]]) -> Optional[str]:
+        # Stores a resume's skills as taxonomy bits, so ranking can build its skill matrix without resolving names.
+        # Returns None when a skill or category is outside the taxonomy; such resumes are matched by name instead.
+        categories, skill_ids = set(), set()
+
+        for category, skill_list in skills.items():
+            position = self.category_positions.get(category)
+            if position is None:
+                return None
+
+            categories.add(position)
+            for skill in skill_list:
+                skill_id = self.skill_id(skill)
+                if skill_id is None or self.skill_categories[skill_id] != position:
+                    return None
+                skill_ids.add(skill_id)
+
+        # Hex of the version, then one bit per category and one bit per skill; every resume encoded by the same
+        # taxonomy has the same width, so a whole chunk decodes with a single join and unpackbits.
+        return self.version + (_bitset(categories, len(self.categories)) + _bitset(skill_ids, len(self.names))).hex()
+
+_lock = threading.Lock()
+_taxonomy: Optional[SkillTaxonomy] = None
+_loaded_mtime: Optional[int] = None
+_checked_at = 0.0
+
+def _load(path: str) -> SkillTaxonomy:
+    with open(path, 'rb') as taxonomy_file:
+        raw = taxonomy_file.read()
+    return SkillTaxonomy(json.loads(raw), hashlib.sha256(raw).hexdigest()[:16])
+
+def get_taxonomy() -> SkillTaxonomy:
+    global _taxonomy, _loaded_mtime, _checked_at
+
+    # Re-checks the file's mtime at most every TAXONOMY_RELOAD_SECONDS, so edits are picked up without a restart.
+    if _taxonomy is not None and time.monotonic() - _checked_at < config.TAXONOMY_RELOAD_SECONDS:
+        return _taxonomy
+
+    with _lock:
+        try:
+            mtime = os.stat(config.SKILL_TAXONOMY_PATH).st_mtime_ns
+            if mtime != _loaded_mtime:
+                _taxonomy = _load(config.SKILL_TAXONOMY_PATH)
+                _loaded_mtime = mtime
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            # Keeps serving the last good taxonomy when an edit leaves the file unreadable.
+            if _taxonomy is None:
+                raise
+            print(f"Error reloading skill taxonomy from {config.SKILL_TAXONOMY_PATH}: {e}")
+
+        _checked_at = time.monotonic()
+        return _taxonomy
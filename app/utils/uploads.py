@@ -0,0 +1,100 @@
+import config
+from typing import Dict, List, Tuple
+from starlette.datastructures import Headers
+from fastapi.responses import JSONResponse
+from fastapi import UploadFile, HTTPException
+
+UPLOAD_CHUNK_BYTES = 64 * 1024
+# Allowance per file for the multipart boundary, part headers and the form fields sent alongside it.
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+TEXT_MIME = "text/plain"
+
+def sniff_mime(head: bytes) -> str:
+    # Identifies the file from its leading bytes rather than trusting the client's content type or extension.
+    if head.startswith(b"%PDF-"):
+        return PDF_MIME
+    if head.startswith(b"PK\x03\x04"):
+        # A .docx is a ZIP container; python-docx rejects any other ZIP when it opens it.
+        return DOCX_MIME
+    if b"\x00" not in head:
+        # Drops up to 3 trailing bytes, in case the chunk boundary split a multi-byte character.
+        for cut in range(4):
+            try:
+                head[:len(head) - cut].decode("utf-8")
+                return TEXT_MIME
+            except UnicodeDecodeError:
+                continue
+    return "application/octet-stream"
+
+async def read_upload(file: UploadFile, max_mb: int, allowed_mime: List[str]) -> Tuple[bytes, str]:
+    max_bytes = max_mb * 1024 * 1024
+
+    # Rejects up front when the multipart part already declares its size.
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(status_code=413, detail=f"'{file.filename}' exceeds the {max_mb} MB limit.")
+
+    chunks = []
+    total = 0
+    mime = None
+
+    # Reads in fixed-size chunks and stops as soon as the file is the wrong type or over the limit.
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        if mime is None:
+            mime = sniff_mime(chunk)
+            if mime not in allowed_mime:
+                raise HTTPException(status_code=415, detail=f"'{file.filename}' is not an allowed file type.")
+
+        total += len(chunk)
+        if total > max_bytes:
+            raise HTTPException(status_code=413, detail=f"'{file.filename}' exceeds the {max_mb} MB limit.")
+        chunks.append(chunk)
+
+    if mime is None:
+        raise HTTPException(status_code=400, detail=f"'{file.filename}' is empty.")
+
+    return b"".join(chunks), mime
+
+def is_allowed_resume(data: bytes) -> bool:
+    return sniff_mime(data[:UPLOAD_CHUNK_BYTES]) in config.ALLOWED_RESUME_MIME
+
+def upload_limit(max_mb: int, files: int = 1) -> int:
+    # Largest request body that can carry `files` files of up to max_mb each.
+    return files * (max_mb * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES)
+
+class UploadSizeLimitMiddleware:
+    # Enforces a body size limit per upload route before the request is read. Starlette spools the whole multipart
+    # body before the handler runs, so read_upload's own checks only apply to what has already been received.
+    def __init__(self, app, limits: Dict[str, int]):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        max_bytes = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body exceeds the {max_bytes} byte limit for this upload."
+
+        # Rejects up front when the client declares the body size, without reading any of it.
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+            await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+            return
+
+        # Otherwise counts the body as it arrives and stops reading once it is over the limit.
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
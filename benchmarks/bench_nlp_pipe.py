@@ -0,0 +1,45 @@
+# Compares per-document full-pipeline spaCy calls with the batched, trimmed nlp.pipe path.
+# Run from the repo root: python -m benchmarks.bench_nlp_pipe --docs 200 --batch-size 64
+import time
+import random
+import argparse
+from app.utils.nlp_registry import load_scorer
+
+WORDS = ['python', 'developer', 'built', 'scalable', 'services', 'with', 'django', 'and', 'postgresql', 'in',
+         'London', 'team', 'led', 'migration', 'to', 'aws', 'the', 'data', 'pipeline', 'for', 'analytics',
+         'engineer', 'at', 'Acme', 'Corp', 'designed', 'react', 'dashboards', 'New', 'York', 'kubernetes']
+
+def make_corpus(docs: int, words_per_doc: int) -> list:
+    rng = random.Random(42)
+    return [' '.join(rng.choice(WORDS) for _ in range(words_per_doc)) + '.' for _ in range(docs)]
+
+def per_document(scorer, texts: list) -> None:
+    # The previous path: one full-pipeline call for noun chunks and another for NER, per resume.
+    for text in texts:
+        doc = scorer.nlp(scorer.preprocess_text(text))
+        set(chunk.text for chunk in doc.noun_chunks)
+        doc = scorer.nlp(text)
+        [ent for ent in doc.ents if ent.label_ == 'GPE']
+
+def batched(scorer, texts: list, batch_size: int) -> None:
+    scorer.build_resume_features_batch(texts, batch_size)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--docs', type=int, default=200)
+    parser.add_argument('--words', type=int, default=400)
+    parser.add_argument('--batch-size', type=int, default=64)
+    args = parser.parse_args()
+
+    scorer = load_scorer()
+    texts = make_corpus(args.docs, args.words)
+
+    for label, run in (('per-document', lambda: per_document(scorer, texts)),
+                       ('nlp.pipe', lambda: batched(scorer, texts, args.batch_size))):
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        print(f"{label:>14}: {args.docs / elapsed:8.1f} docs/sec ({elapsed:.2f}s)")
+
+if __name__ == '__main__':
+    main()
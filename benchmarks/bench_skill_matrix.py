@@ -0,0 +1,72 @@
+# Compares per-resume skill scoring with the SkillMatrix engine and checks the scores are identical.
+# The stored-bits row is the ranking path: skills are encoded as taxonomy bits once at upload (SkillTaxonomy.encode).
+# Run from the repo root: python -m benchmarks.bench_skill_matrix --resumes 10000
+import time
+import spacy
+import random
+import argparse
+from app.utils.similarity import SimilarityScorer
+
+def make_skills(scorer: SimilarityScorer, rng: random.Random, max_per_category: int) -> dict:
+    skills = {}
+    # Samples synonyms as well as canonical names, since both may be stored.
+    for category, skill_list in scorer.taxonomy.category_forms.items():
+        # Leaves some categories out entirely, since that changes which weights a resume is normalized by.
+        if rng.random() < 0.2:
+            continue
+        skills[category] = rng.sample(skill_list, rng.randint(0, min(max_per_category, len(skill_list))))
+    return skills
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resumes', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # Skill scoring never runs the statistical pipeline, so a blank tokenizer is enough here.
+    scorer = SimilarityScorer(nlp=spacy.blank('en'))
+    rng = random.Random(7)
+    job_skills = make_skills(scorer, rng, 4)
+    pool = [make_skills(scorer, rng, 6) for _ in range(args.resumes)] + [{}]
+    skill_bits = [scorer.taxonomy.encode(skills) for skills in pool]
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        expected = [scorer.calculate_skill_match_score(job_skills, skills) for skills in pool]
+    scalar = (time.perf_counter() - started) / args.repeat
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        actual = scorer.calculate_skill_match_scores(job_skills, pool)
+    by_name = (time.perf_counter() - started) / args.repeat
+    assert actual == expected, "SkillMatrix scores differ from calculate_skill_match_score"
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        actual = scorer.calculate_skill_match_scores(job_skills, pool, skill_bits)
+    end_to_end = (time.perf_counter() - started) / args.repeat
+
+    # Scores the same pool again with the encoding reused, as when one pool is ranked against several jobs.
+    skill_matrix = scorer.build_skill_matrix(job_skills)
+    encoded = skill_matrix.encode(pool, skill_bits)
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        skill_matrix.score(encoded, job_skills)
+    score_only = (time.perf_counter() - started) / args.repeat
+
+    assert actual == expected, "SkillMatrix scores differ from calculate_skill_match_score"
+
+    # Missing skills from the matrix, by skill names and by stored bits, match get_missing_skills per resume.
+    for missing in (scorer.get_missing_skills_batch(job_skills, pool), scorer.get_missing_skills_batch(job_skills, pool, skill_bits)):
+        for skills, row in zip(pool, missing):
+            reference = scorer.get_missing_skills(job_skills, skills)
+            assert {k: set(v) for k, v in row.items()} == {k: set(v) for k, v in reference.items()}, "SkillMatrix missing skills differ from get_missing_skills"
+
+    print(f"resumes: {len(pool)} (scores identical)")
+    print(f"per-resume loop:        {scalar * 1000:8.1f} ms")
+    print(f"matrix, skill names:    {by_name * 1000:8.1f} ms ({scalar / by_name:.1f}x)")
+    print(f"matrix, stored bits:    {end_to_end * 1000:8.1f} ms ({scalar / end_to_end:.1f}x)")
+    print(f"matrix score (encoded): {score_only * 1000:8.1f} ms ({scalar / score_only:.1f}x)")
+
+if __name__ == '__main__':
+    main()
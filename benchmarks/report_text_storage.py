@@ -0,0 +1,93 @@
+# Reports table size and bytes read for resume text stored inline (the previous layout) vs compressed in text_blobs.
+# The corpus uploads the same resumes to several jobs, as happens when one candidate pool is screened more than once.
+# Run from the repo root: python -m benchmarks.report_text_storage --resumes 500 --jobs 4
+import os
+import sys
+import asyncio
+import uuid
+import random
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, insert, select
+
+def make_corpus(rng: random.Random, resumes: int) -> list:
+    words = ['python', 'django', 'aws', 'led', 'team', 'built', 'services', 'data', 'pipeline', 'react',
+             'kubernetes', 'designed', 'customers', 'latency', 'reduced', 'migrated', 'postgres', 'owned']
+    return [' '.join(rng.choice(words) for _ in range(rng.randint(300, 900))) for _ in range(resumes)]
+
+def resume_rows(texts: list) -> list:
+    # Stored without noun phrases, so a ranking pass has to read every resume's text.
+    return [{"uuid": str(uuid.uuid4()), "filename": f"resume_{i}.pdf", "text": text, "skills": {}, "experience": {}}
+            for i, text in enumerate(texts)]
+
+async def store_inline(db, Resume, Job_Application, job_id: str, texts: list) -> None:
+    expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+    rows = resume_rows(texts)
+    await db.execute(insert(Resume), [{**row, "job_id": job_id, "expires_at": expires_at} for row in rows])
+    await db.execute(insert(Job_Application), [{"job_id": job_id, "resume_uuid": row["uuid"]} for row in rows])
+    await db.commit()
+
+async def bytes_read(db, crud, Text_Blob, job_ids: list) -> int:
+    # Sums the text each ranking pass hands to the scorer, plus the compressed bytes fetched for it.
+    total = 0
+    for job_id in job_ids:
+        async for batch in crud.iter_resume_batches(db, job_id):
+            hashes = [r["text_hash"] for r in batch if r.get("text_hash")]
+            if hashes:
+                total += await db.scalar(select(func.sum(func.length(Text_Blob.data))).where(Text_Blob.sha256.in_(hashes))) or 0
+            else:
+                total += sum(len(r.get("text", "").encode("utf-8")) for r in batch)
+    return total
+
+async def run(args, layout: str, path: str) -> dict:
+    from app.db import crud
+    from app.db.database import Base, engine, SessionLocal
+    from app.db.models import Job_Application, Resume, Text_Blob
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    texts = make_corpus(random.Random(7), args.resumes)
+
+    async with SessionLocal() as db:
+        job_ids = [(await crud.insert_job_description(db, f"job {i}"))["id"] for i in range(args.jobs)]
+        for job_id in job_ids:
+            if layout == "inline":
+                await store_inline(db, Resume, Job_Application, job_id, texts)
+            else:
+                await crud.insert_resumes(db, job_id, resume_rows(texts))
+
+        stored = (await db.scalar(select(func.sum(func.length(Resume.text))))) or 0
+        stored += (await db.scalar(select(func.sum(func.length(Text_Blob.data))))) or 0
+        read = await bytes_read(db, crud, Text_Blob, job_ids)
+
+    await engine.dispose()
+    return {"stored": stored, "read": read, "file": os.path.getsize(path)}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--resumes', type=int, default=500)
+    parser.add_argument('--jobs', type=int, default=4)
+    parser.add_argument('--layout', choices=['inline', 'blob'], default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.layout:
+        # Runs one layout against a fresh SQLite file; each layout gets its own process, since the app reads DATABASE_URL once.
+        path = os.path.join(tempfile.mkdtemp(), f"{args.layout}.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+        result = asyncio.run(run(args, args.layout, path))
+        print(f"{result['stored']} {result['read']} {result['file']}")
+        return
+
+    print(f"resumes: {args.resumes}, jobs: {args.jobs}")
+    print(f"{'layout':>8} {'text bytes':>12} {'db file':>12} {'read/rank':>12}")
+    for layout in ('inline', 'blob'):
+        output = subprocess.run([sys.executable, '-m', 'benchmarks.report_text_storage', '--resumes', str(args.resumes),
+                                 '--jobs', str(args.jobs), '--layout', layout], capture_output=True, text=True, check=True).stdout
+        stored, read, file_size = (int(value) for value in output.split()[-3:])
+        print(f"{layout:>8} {stored:>12} {file_size:>12} {read // args.jobs:>12}")
+
+if __name__ == '__main__':
+    main()
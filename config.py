@@ -12,6 +12,27 @@ DB_EXPIRY_HOURS = int(os.getenv("DB_EXPIRY_HOURS", 12))
 
 MAX_RESUME_MB = int(os.getenv("MAX_RESUME_MB", default=3))
 MAX_JOB_DESCRIPTION_MB = int(os.getenv("MAX_JOB_DESCRIPTION_MB", default=2))
+MAX_RESUME_FILES = int(os.getenv("MAX_RESUME_FILES", default=100))
 
-ALLOWED_RESUME_MIME = os.getenv("ALLOWED_RESUME_MIME", default="application/pdf").split(",")
-ALLOWED_JOB_DESCRIPTION_MIME = os.getenv("ALLOWED_JOB_DESCRIPTION_MIME", default="application/pdf, text/plain").split(",")
\ No newline at end of file
+ALLOWED_RESUME_MIME = [m.strip() for m in os.getenv("ALLOWED_RESUME_MIME", default="application/pdf").split(",")]
+ALLOWED_JOB_DESCRIPTION_MIME = [m.strip() for m in os.getenv("ALLOWED_JOB_DESCRIPTION_MIME", default="application/pdf,text/plain,application/vnd.openxmlformats-officedocument.wordprocessingml.document").split(",")]
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", default="en_core_web_sm")
+NLP_BATCH_SIZE = int(os.getenv("NLP_BATCH_SIZE", default=64))
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", default=os.cpu_count() or 1))
+PARSE_CACHE_EXPIRY_HOURS = int(os.getenv("PARSE_CACHE_EXPIRY_HOURS", default=DB_EXPIRY_HOURS))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", default=32))
+ARCHIVE_TASK_TTL_SECONDS = int(os.getenv("ARCHIVE_TASK_TTL_SECONDS", default=3600))
+MAX_ARCHIVE_TASKS = int(os.getenv("MAX_ARCHIVE_TASKS", default=1000))
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", default=PARSE_WORKERS))
+SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "data", "skill_taxonomy.json"))
+TAXONOMY_RELOAD_SECONDS = float(os.getenv("TAXONOMY_RELOAD_SECONDS", default=5))
+DB_INSERT_CHUNK = int(os.getenv("DB_INSERT_CHUNK", default=500))
+CLEANUP_BATCH_SIZE = int(os.getenv("CLEANUP_BATCH_SIZE", default=1000))
+CLEANUP_INTERVAL_SECONDS = int(os.getenv("CLEANUP_INTERVAL_SECONDS", default=600))
+DB_STREAM_BATCH = int(os.getenv("DB_STREAM_BATCH", default=1000))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", default=5))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", default=10))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", default=30))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", default=0))
+TEXT_COMPRESSION_LEVEL = int(os.getenv("TEXT_COMPRESSION_LEVEL", default=6))